@@ -64,13 +64,14 @@ def to_core_posting(model: PostingModel) -> data.Posting:
 def from_core_posting(core: data.Posting) -> PostingModel:
     from typing import cast
 
-    return PostingModel(
+    # The loader has already validated entries read from the ledger
+    return PostingModel.from_trusted(
         account=AccountName(core.account),
         units=from_core_amount(cast(amount.Amount, core.units)),
         cost=from_core_cost(cast(position.Cost | None, core.cost)),
         price=from_core_amount(cast(amount.Amount, core.price)) if core.price else None,
         flag=core.flag or "",
-        meta=core.meta or {},
+        meta=dict(core.meta) if core.meta else {},
     )
 
 
@@ -82,22 +83,22 @@ def to_core_transaction(model: TransactionModel) -> data.Transaction:
         flag=model.flag,
         payee=model.payee,
         narration=model.narration,
-        tags=frozenset(model.tags) if model.tags else frozenset(),
-        links=frozenset(model.links) if model.links else frozenset(),
+        tags=model.tags,
+        links=model.links,
         postings=postings,
     )
 
 
 def from_core_transaction(core: data.Transaction) -> TransactionModel:
-    return TransactionModel(
+    return TransactionModel.from_trusted(
         date=core.date,
         flag=core.flag or "",
         payee=core.payee,
         narration=core.narration or "",
-        tags=set(core.tags) if core.tags else set(),
-        links=set(core.links) if core.links else set(),
+        tags=core.tags or frozenset(),
+        links=core.links or frozenset(),
         postings=[from_core_posting(p) for p in core.postings],
-        meta=core.meta or {},
+        meta=dict(core.meta) if core.meta else {},
     )
 
 
@@ -2,6 +2,7 @@ import os
 import sys
 from decimal import Decimal
 from pathlib import Path
+from typing import Any
 
 from rich.console import Console
 from rich.table import Table
@@ -9,6 +10,27 @@ from rich.table import Table
 console = Console()
 error_console = Console(stderr=True)
 
+# Shared Decimal constants, so the report loops do not rebuild them per row
+_ZERO = Decimal(0)
+_BALANCE_TOLERANCE = Decimal("0.0001")
+
+# Column schemas shared by the report tables: (header, add_column kwargs)
+_BALANCE_COLUMNS: tuple[tuple[str, dict[str, Any]], ...] = (
+    ("Account", {"style": "cyan"}),
+    ("Balance", {"justify": "right"}),
+)
+_HOLDINGS_COLUMNS: tuple[tuple[str, dict[str, Any]], ...] = (
+    ("Account", {"style": "cyan"}),
+    ("Holdings", {"justify": "left"}),
+)
+_AUDIT_COLUMNS: tuple[tuple[str, dict[str, Any]], ...] = (
+    ("Date", {"style": "green"}),
+    ("Description", {}),
+    ("Account", {"style": "cyan"}),
+    ("Amount", {"justify": "right"}),
+    ("Basis/Price", {}),
+)
+
 
 def read_json_input(json_data: str) -> str:
     """Read JSON from a string or from STDIN when json_data is '-'."""
@@ -39,10 +61,47 @@ def _is_table_format() -> bool:
     return True
 
 
+def _fmt2(amount: Decimal) -> str:
+    """Format an amount with thousands separators and two decimal places."""
+    return format(amount, ",.2f")
+
+
+def _format_units(units: dict[str, Decimal]) -> str:
+    """Format a {currency: amount} mapping as a comma-separated, currency-sorted string."""
+    if len(units) == 1:
+        # Single-currency accounts dominate real ledgers; skip the sort
+        ((curr, amt),) = units.items()
+        return f"{_fmt2(amt)} {curr}"
+    return ", ".join(f"{_fmt2(amt)} {curr}" for curr, amt in sorted(units.items()))
+
+
+def _make_table(title: str, columns: tuple[tuple[str, dict[str, Any]], ...]) -> Table:
+    """Return a fresh Table configured with the given column schema."""
+    table = Table(title=title)
+    for name, kwargs in columns:
+        table.add_column(name, **kwargs)
+    return table
+
+
+def _make_balances_table(title: str) -> Table:
+    return _make_table(f"[bold]{title}[/bold]", _BALANCE_COLUMNS)
+
+
+def _make_holdings_table(title: str, target_currencies: list[str]) -> Table:
+    table = _make_table(title, _HOLDINGS_COLUMNS)
+    for curr in target_currencies:
+        table.add_column(f"Value ({curr})", justify="right")
+        table.add_column(f"Cost ({curr})", justify="right")
+        table.add_column("Gain (%)", justify="right")
+    return table
+
+
+def _make_audit_table(currency: str) -> Table:
+    return _make_table(f"Audit Report: {currency}", _AUDIT_COLUMNS)
+
+
 def print_balances_table(balances, title) -> None:
-    table = Table(title=f"[bold]{title}[/bold]")
-    table.add_column("Account", style="cyan")
-    table.add_column("Balance", justify="right")
+    table = _make_balances_table(title)
 
     totals_debit: dict[str, Decimal] = {}
     totals_credit: dict[str, Decimal] = {}
@@ -53,8 +112,7 @@ def print_balances_table(balances, title) -> None:
         bal_cost = account_data["cost"]
 
         # Format rows using units
-        bal_str = ", ".join(f"{amt:,.2f} {curr}" for curr, amt in sorted(bal_units.items()))
-        table.add_row(account, bal_str)
+        table.add_row(account, _format_units(bal_units))
 
         # Aggregate totals using COST to verify double-entry balance
         if (
@@ -63,32 +121,32 @@ def print_balances_table(balances, title) -> None:
         ):
             for curr, amt in bal_cost.items():
                 if amt > 0:
-                    totals_debit[curr] = totals_debit.get(curr, Decimal(0)) + amt
+                    totals_debit[curr] = totals_debit.get(curr, _ZERO) + amt
                 else:
-                    totals_credit[curr] = totals_credit.get(curr, Decimal(0)) + amt
+                    totals_credit[curr] = totals_credit.get(curr, _ZERO) + amt
 
     if totals_debit or totals_credit:
         table.add_section()
 
         all_currencies = sorted(set(totals_debit.keys()) | set(totals_credit.keys()))
         for curr in all_currencies:
-            debit = totals_debit.get(curr, Decimal(0))
-            credit = totals_credit.get(curr, Decimal(0))
+            debit = totals_debit.get(curr, _ZERO)
+            credit = totals_credit.get(curr, _ZERO)
             diff = debit + credit
 
-            if abs(diff) < Decimal("0.0001"):
+            if abs(diff) < _BALANCE_TOLERANCE:
                 status = "[green]✓ Balanced[/green]"
             else:
-                status = f"[yellow]Exposure: {diff:,.2f} {curr}[/yellow]"
+                status = f"[yellow]Exposure: {_fmt2(diff)} {curr}[/yellow]"
 
             table.add_row(
                 f"[bold]NET POSITION {curr}[/bold]",
-                f"{debit:,.2f} (Dr) | {credit:,.2f} (Cr) | {status}",
+                f"{_fmt2(debit)} (Dr) | {_fmt2(credit)} (Cr) | {status}",
             )
 
     console.print(table)
     if any(
-        abs(totals_debit.get(c, Decimal(0)) + totals_credit.get(c, Decimal(0))) >= Decimal("0.0001")
+        abs(totals_debit.get(c, _ZERO) + totals_credit.get(c, _ZERO)) >= _BALANCE_TOLERANCE
         for c in sorted(list(totals_debit.keys()) + list(totals_credit.keys()))
     ):
         console.print(
@@ -99,31 +157,22 @@ def print_balances_table(balances, title) -> None:
 
 def print_holdings_table(holdings_data, valuation_method, target_currencies) -> None:
     title = f"[bold]Portfolio Holdings ({valuation_method.capitalize()} Value)[/bold]"
-    table = Table(title=title)
-    table.add_column("Account", style="cyan")
-    table.add_column("Holdings", justify="left")
-
-    for curr in target_currencies:
-        table.add_column(f"Value ({curr})", justify="right")
-        table.add_column(f"Cost ({curr})", justify="right")
-        table.add_column("Gain (%)", justify="right")
+    table = _make_holdings_table(title, target_currencies)
 
     for acc in sorted(holdings_data["accounts"].keys()):
         data = holdings_data["accounts"][acc]
-        units_str = ", ".join(f"{v:,.2f} {k}" for k, v in sorted(data["units"].items()))
-
-        row = [acc, units_str]
+        row = [acc, _format_units(data["units"])]
         for curr in target_currencies:
-            m_val = data["market_values"].get(curr, Decimal(0))
-            c_val = data["cost_basis"].get(curr, Decimal(0))
-            gain = data["unrealized_gains"].get(curr, Decimal(0))
+            m_val = data["market_values"].get(curr, _ZERO)
+            c_val = data["cost_basis"].get(curr, _ZERO)
+            gain = data["unrealized_gains"].get(curr, _ZERO)
 
-            gain_pct = (gain / c_val * 100) if c_val != 0 else Decimal(0)
+            gain_pct = (gain / c_val * 100) if c_val != 0 else _ZERO
 
             gain_color = "green" if gain >= 0 else "red"
-            gain_str = f"[{gain_color}]{gain:,.2f} ({gain_pct:.1f}%)[/{gain_color}]"
+            gain_str = f"[{gain_color}]{_fmt2(gain)} ({gain_pct:.1f}%)[/{gain_color}]"
 
-            row.extend([f"{m_val:,.2f}", f"{c_val:,.2f}", gain_str])
+            row.extend([_fmt2(m_val), _fmt2(c_val), gain_str])
         table.add_row(*row)
 
     if target_currencies:
@@ -131,18 +180,18 @@ def print_holdings_table(holdings_data, valuation_method, target_currencies) ->
         footer_row = ["[bold]TOTAL[/bold]", ""]
         for curr in target_currencies:
             totals = holdings_data["totals"].get(curr, {})
-            m_total = totals.get("market", Decimal(0))
-            c_total = totals.get("cost", Decimal(0))
-            gain_total = totals.get("gain", Decimal(0))
-            gain_pct_total = (gain_total / c_total * 100) if c_total != 0 else Decimal(0)
+            m_total = totals.get("market", _ZERO)
+            c_total = totals.get("cost", _ZERO)
+            gain_total = totals.get("gain", _ZERO)
+            gain_pct_total = (gain_total / c_total * 100) if c_total != 0 else _ZERO
 
             gain_color = "green" if gain_total >= 0 else "red"
 
             footer_row.extend(
                 [
-                    f"[bold]{m_total:,.2f}[/bold]",
-                    f"[bold]{c_total:,.2f}[/bold]",
-                    f"[bold][{gain_color}]{gain_total:,.2f} "
+                    f"[bold]{_fmt2(m_total)}[/bold]",
+                    f"[bold]{_fmt2(c_total)}[/bold]",
+                    f"[bold][{gain_color}]{_fmt2(gain_total)} "
                     f"({gain_pct_total:.1f}%)[/{gain_color}][/bold]",
                 ]
             )
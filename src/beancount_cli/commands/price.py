@@ -16,6 +16,9 @@ from beancount_cli.services import LedgerService, MapService, PriceService
 
 app = typer.Agentyper(help="Manage prices.")
 
+# Fetched prices are written with six decimal places
+_PRICE_QUANTUM = Decimal("1.000000")
+
 
 @app.command(name="check")
 def price_check(
@@ -119,7 +122,7 @@ def price_fetch(
         new_price_entries = []
         # Build a set of existing (date, currency) for fast redundancy check
         # This keeps the streaming output clean of duplicates already in the ledger
-        existing_prices = {(e.date, e.currency) for e in entries if isinstance(e, data.Price)}
+        existing_prices = {(e.date, e.currency) for e in ledger_service.entries_of(data.Price)}
 
         try:
             with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
@@ -130,7 +133,7 @@ def price_fetch(
                     if price_entry:
                         price_entry = price_entry._replace(
                             amount=price_entry.amount._replace(
-                                number=price_entry.amount.number.quantize(Decimal("1.000000"))
+                                number=price_entry.amount.number.quantize(_PRICE_QUANTUM)
                             )
                         )
 
@@ -197,9 +200,7 @@ def _warn_missing_price_meta(ledger_service: LedgerService, context: str) -> Non
     """Warn about held commodities that lack 'price' metadata and cannot be priced."""
     held = ledger_service.get_inventory(date.today())
     op_currs = set(ledger_service.get_operating_currencies()) or {"USD"}
-    commodity_meta = {
-        e.currency: e.meta for e in ledger_service.entries if isinstance(e, data.Commodity)
-    }
+    commodity_meta = {e.currency: e.meta for e in ledger_service.entries_of(data.Commodity)}
     for curr in sorted(held):
         if curr in op_currs:
             continue
@@ -5,6 +5,7 @@ import agentyper as typer
 
 from beancount_cli.commands.common import (
     _is_table_format,
+    _make_audit_table,
     console,
     get_ledger_file,
     print_balances_table,
@@ -174,58 +175,46 @@ def report_audit(
             )
             sys.exit(typer.EXIT_VALIDATION)
 
-    txs = tx_service.list_transactions(currency=audit_currency)
-    txs.sort(key=lambda x: x.date, reverse=True)
+    pairs = tx_service.list_currency_postings(audit_currency)
+    pairs.sort(key=lambda x: x[0].date, reverse=True)
 
     if not all_:
-        txs = txs[:limit]
+        pairs = pairs[:limit]
 
     if _is_table_format():
-        from rich.table import Table
-
-        table = Table(title=f"Audit Report: {audit_currency}")
-        table.add_column("Date", style="green")
-        table.add_column("Description")
-        table.add_column("Account", style="cyan")
-        table.add_column("Amount", justify="right")
-        table.add_column("Basis/Price")
-
-        for tx in txs:
-            for p in tx.postings:
-                if p.units and p.units.currency == audit_currency:
-                    basis = ""
-                    if p.price:
-                        basis = f"@ {p.price.number} {p.price.currency}"
-                    elif p.cost:
-                        basis = f"{{{p.cost.number} {p.cost.currency}}}"
-
-                    desc = f"{tx.payee}: {tx.narration}" if tx.payee else tx.narration
-                    table.add_row(
-                        str(tx.date),
-                        desc,
-                        p.account,
-                        f"{p.units.number:,.2f} {p.units.currency}",
-                        basis,
-                    )
+        table = _make_audit_table(audit_currency)
+
+        for tx, postings in pairs:
+            desc = f"{tx.payee}: {tx.narration}" if tx.payee else tx.narration
+            for p in postings:
+                basis = ""
+                if p.price:
+                    basis = f"@ {p.price.number} {p.price.currency}"
+                elif p.cost:
+                    basis = f"{{{p.cost.number} {p.cost.currency}}}"
+
+                table.add_row(
+                    str(tx.date),
+                    desc,
+                    p.account,
+                    f"{p.units.number:,.2f} {p.units.currency}",
+                    basis,
+                )
         console.print(table)
-        if not all_ and len(txs) == limit:
+        if not all_ and len(pairs) == limit:
             console.print(f"[dim](Showing last {limit} transactions. Use --all to see more.)[/dim]")
     else:
-        data = []
-        for tx in txs:
-            for p in tx.postings:
-                if p.units and p.units.currency == audit_currency:
-                    data.append(
-                        {
-                            "Date": str(tx.date),
-                            "Description": f"{tx.payee}: {tx.narration}"
-                            if tx.payee
-                            else tx.narration,
-                            "Account": p.account,
-                            "Amount": str(p.units.number),
-                            "Currency": p.units.currency,
-                            "Price": str(p.price.number) if p.price else "",
-                            "Cost": str(p.cost.number) if p.cost else "",
-                        }
-                    )
+        data = [
+            {
+                "Date": str(tx.date),
+                "Description": f"{tx.payee}: {tx.narration}" if tx.payee else tx.narration,
+                "Account": p.account,
+                "Amount": str(p.units.number),
+                "Currency": p.units.currency,
+                "Price": str(p.price.number) if p.price else "",
+                "Cost": str(p.cost.number) if p.cost else "",
+            }
+            for tx, postings in pairs
+            for p in postings
+        ]
         typer.output(data, title=f"Audit {audit_currency}")
@@ -1,6 +1,8 @@
 import json
+import os
 import subprocess  # nosec B404
 import sys
+import tempfile
 from pathlib import Path
 
 import agentyper as typer
@@ -66,6 +68,7 @@ def tree(
 ):
     """Visualize the tree of included files."""
     actual_file = get_ledger_file(ledger_file or file)
+    # Only include lines are scanned; the ledger itself is never loaded
     service = MapService(actual_file)
     tree_dict = service.get_include_tree()
 
@@ -82,6 +85,23 @@ def tree(
         typer.output(tree_dict, title="File Tree")
 
 
+def format_ledger(actual_file: Path, *, _runner=None) -> None:
+    """Run bean-format over a ledger file in place; `_runner` replaces subprocess.run."""
+    run = _runner or subprocess.run
+    # Write next to the ledger so the final rename stays on one filesystem
+    with tempfile.NamedTemporaryFile(
+        mode="w", delete=False, dir=actual_file.parent, suffix=".tmp"
+    ) as tmp:
+        tmp_path = Path(tmp.name)
+
+    try:
+        cmd = ["bean-format", "-c", "50", "-o", str(tmp_path), str(actual_file)]
+        run(cmd, check=True, capture_output=True, text=True)  # nosec B603
+        os.replace(tmp_path, actual_file)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
 def format_cmd(
     ledger_file: Path | None = typer.Argument(None, help="Path to ledger file"),
     file: Path | None = typer.Option(
@@ -92,18 +112,8 @@ def format_cmd(
     """Format ledger file(s)."""
     actual_file = get_ledger_file(ledger_file or file)
     try:
-        import shutil
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as tmp:
-            tmp_path = Path(tmp.name)
-
-        cmd = ["bean-format", "-c", "50", "-o", str(tmp_path), str(actual_file)]
-        subprocess.run(cmd, check=True, capture_output=True, text=True)  # nosec B603
-
-        shutil.move(str(tmp_path), str(actual_file))
+        format_ledger(actual_file)
         console.print(f"[green]Formatted {actual_file}[/green]")
-
     except subprocess.CalledProcessError as e:
         console.print(f"[red]Error running bean-format: {e.stderr}[/red]")
         sys.exit(typer.EXIT_SYSTEM)
@@ -1,4 +1,3 @@
-import json
 from pathlib import Path
 
 import agentyper as typer
@@ -56,13 +55,14 @@ def tx_add(
     actual_file = get_ledger_file(ledger_file or file)
     service = TransactionService(actual_file)
 
-    data = json.loads(read_json_input(json_data))
+    content = read_json_input(json_data)
 
-    if isinstance(data, list):
+    # Validate straight from JSON so pydantic-core skips the intermediate dict
+    if content.lstrip().startswith("["):
         ta = TypeAdapter(list[TransactionModel])
-        models = ta.validate_python(data)
+        models = ta.validate_json(content)
         for m in models:
             service.add_transaction(m, draft=draft, print_only=print_only, target_file=target)
     else:
-        model = TransactionModel(**data)
+        model = TransactionModel.model_validate_json(content)
         service.add_transaction(model, draft=draft, print_only=print_only, target_file=target)
@@ -1,27 +1,80 @@
+import os
+import re
+from dataclasses import dataclass, field
+from functools import cache
 from pathlib import Path
+from typing import Any
 
-from pydantic import Field
-from pydantic_settings import BaseSettings, SettingsConfigDict
 
+def _first_existing(*paths: Path) -> Path | None:
+    """Return the first path that exists, using a single stat() per candidate."""
+    for p in paths:
+        try:
+            os.stat(p)
+        except OSError:
+            continue
+        return p
+    return None
 
-class CliConfig(BaseSettings):
-    file: Path | None = Field(default=None, validation_alias="BEANCOUNT_FILE")
-    path: Path | None = Field(default=None, validation_alias="BEANCOUNT_PATH")
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+# An unquoted value ends at whitespace followed by '#', as in python-dotenv
+_INLINE_COMMENT = re.compile(r"\s+#.*")
+
+
+@cache
+def _read_dotenv(env_file: str) -> dict[str, str]:
+    """
+    Parse simple KEY=VALUE lines from a dotenv file once per process. Pass an absolute
+    path so a later chdir() reads the new directory's file rather than a cached one.
+    """
+    try:
+        with open(env_file, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return {}
+
+    values = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, _, value = line.removeprefix("export ").partition("=")
+        value = value.strip()
+        end = value.find(value[0], 1) if value[:1] in ("'", '"') else -1
+        if end > 0:
+            value = value[1:end]
+        else:
+            value = _INLINE_COMMENT.sub("", value)
+        values[key.strip()] = value
+    return values
+
+
+def _env_path(name: str) -> Path | None:
+    """Read a path setting from the environment, falling back to .env."""
+    value = os.environ.get(name) or _read_dotenv(os.path.abspath(".env")).get(name)
+    return Path(value) if value else None
+
+
+_UNRESOLVED = object()
+
+
+@dataclass(slots=True, frozen=True)
+class CliConfig:
+    file: Path | None = field(default_factory=lambda: _env_path("BEANCOUNT_FILE"))
+    path: Path | None = field(default_factory=lambda: _env_path("BEANCOUNT_PATH"))
+    # Fallback lookup result, filled on first use; the environment is read once at construction
+    _fallback: Any = field(default=_UNRESOLVED, init=False, repr=False, compare=False)
 
     def get_resolved_ledger(self, override: Path | None = None) -> Path | None:
         if override:
             return override
         if self.file:
             return self.file
-        if self.path:
-            p = self.path / "main.beancount"
-            if p.exists():
-                return p
-
-        p = Path("main.beancount")
-        if p.exists():
-            return p
 
-        return None  # Let the calling code handle missing path
+        if self._fallback is _UNRESOLVED:
+            candidates = [Path("main.beancount")]
+            if self.path:
+                candidates.insert(0, self.path / "main.beancount")
+            # Let the calling code handle a missing path
+            object.__setattr__(self, "_fallback", _first_existing(*candidates))
+        return self._fallback
@@ -1,39 +1,57 @@
 import csv
-import io
 import json
 import re
 import sys
+from collections.abc import Iterator
+from itertools import zip_longest
+from operator import itemgetter
 from typing import Any, TextIO
 
+# Matches markup tags such as [bold] or [/green]; the character class avoids backtracking
+_TAG_RE = re.compile(r"\[/?[^\]]*\]")
+
+_ANSI_RESET = "\033[0m"
+_ANSI_CODES = {
+    "red": "\033[91m",
+    "green": "\033[92m",
+    "yellow": "\033[93m",
+    "blue": "\033[94m",
+    "cyan": "\033[96m",
+    "bold": "\033[1m",
+    "dim": "\033[2m",
+    "bold blue": "\033[1m\033[94m",
+}
+# Full tag text -> ANSI sequence, e.g. "[red]" -> "\033[91m", "[/red]" -> reset
+_ANSI_TAGS = {f"[{name}]": code for name, code in _ANSI_CODES.items()}
+_ANSI_TAGS.update({f"[/{name}]": _ANSI_RESET for name in _ANSI_CODES})
+_ANSI_TAG_SUB = re.compile(r"\[/?[^\[\]]{1,20}\]").sub
+
+
+def _ansi_for_tag(m: re.Match[str], _get=_ANSI_TAGS.get) -> str:
+    # Unknown bracketed text passes through unchanged
+    tag = m.group()
+    return _get(tag, tag)
+
 
 def apply_tags(s: str) -> str:
-    msg = str(s)
-    # Simple replacement dictionary
-    colors = {
-        "[red]": "\033[91m",
-        "[/red]": "\033[0m",
-        "[green]": "\033[92m",
-        "[/green]": "\033[0m",
-        "[yellow]": "\033[93m",
-        "[/yellow]": "\033[0m",
-        "[blue]": "\033[94m",
-        "[/blue]": "\033[0m",
-        "[cyan]": "\033[96m",
-        "[/cyan]": "\033[0m",
-        "[bold]": "\033[1m",
-        "[/bold]": "\033[0m",
-        "[dim]": "\033[2m",
-        "[/dim]": "\033[0m",
-        "[bold blue]": "\033[1m\033[94m",
-        "[/bold blue]": "\033[0m",
-    }
-    for tag, ansi in colors.items():
-        msg = msg.replace(tag, ansi)
-    return msg
+    # One scan of the string regardless of how many tags are known
+    return _ANSI_TAG_SUB(_ansi_for_tag, str(s))
 
 
 def strip_tags(s: str) -> str:
-    return re.sub(r"\[/?.*?\]", "", str(s))
+    s = s if isinstance(s, str) else str(s)
+    # Most cells carry no markup; a substring check is far cheaper than the regex engine
+    return s if "[" not in s else _TAG_RE.sub("", s)
+
+
+def _visible_len(s: str) -> int:
+    """Length of `s` as displayed, i.e. without markup tags."""
+    return len(s) if "[" not in s else len(_TAG_RE.sub("", s))
+
+
+def _get_file(console: "Console") -> TextIO:
+    """Return the stream a console writes to, resolving sys.stdout at call time."""
+    return console.file or sys.stdout
 
 
 class Console:
@@ -41,84 +59,111 @@ class Console:
         self.file = file
 
     def print(self, msg: Any = ""):
-        out_file = self.file or sys.stdout
-        if isinstance(msg, Table) or isinstance(msg, Tree):
+        out_file = _get_file(self)
+        if isinstance(msg, Table):
+            msg.write_to(out_file)
+            return
+        if isinstance(msg, Tree):
             print(apply_tags(str(msg)), file=out_file)
             return
         print(apply_tags(str(msg)), file=out_file)
 
 
+# Picks the visible length out of a (value, visible length) cell
+_VISIBLE_LEN = itemgetter(1)
+
+
 class Table:
     def __init__(self, title: str = ""):
         self.title = title
         self.columns: list[dict[str, str]] = []
         self.rows: list[list[Any] | None] = []
+        # Rendered text, reset whenever a column, row or section is added
+        self._cached: str | None = None
 
     def add_column(self, name: str, style: str = "", justify: str = "left"):
         self.columns.append({"name": name, "style": style, "justify": justify})
+        self._cached = None
 
     def add_row(self, *args):
         self.rows.append(list(args))
+        self._cached = None
+
+    def add_rows_columnar(self, columns: list[list[Any]]):
+        """Add rows given column by column; every column must have the same length."""
+        self.rows.extend(map(list, zip(*columns, strict=True)))
+        self._cached = None
 
     def add_section(self):
         # We represent sections as a None row if last row wasn't None
         if self.rows and self.rows[-1] is not None:
             self.rows.append(None)
+            self._cached = None
 
     def __str__(self):
-        # Calculate col widths based on raw string length (ignoring color tags)
-        col_widths = [len(c["name"]) for c in self.columns]
-        for row in self.rows:
-            if row is not None:
-                for i, col_val in enumerate(row):
-                    if i < len(col_widths):
-                        col_widths[i] = max(col_widths[i], len(strip_tags(col_val)))
-
-        lines = []
-        if self.title:
-            lines.append(self.title)
-
-        # Header
-        header_cells = []
-        for i, c in enumerate(self.columns):
-            w = col_widths[i]
+        if self._cached is None:
+            self._cached = "\n".join(self._iter_lines())
+        return self._cached
+
+    def write_to(self, file: TextIO) -> None:
+        """Write the table to `file` line by line, converting markup to ANSI codes."""
+        if self._cached is not None:
+            file.write(apply_tags(self._cached))
+            file.write("\n")
+            return
+        # Streaming avoids materializing the whole rendered table as one string
+        for line in self._iter_lines():
+            file.write(apply_tags(line))
+            file.write("\n")
+
+    def _iter_lines(self) -> Iterator[str]:
+        n_cols = len(self.columns)
+
+        # Stringify each cell once and remember its visible length (ignoring color tags),
+        # so the width pass and the render pass share the same work. The per-cell "[" check
+        # in _visible_len keeps plain cells on len(); batching the check per row measured slower
+        processed_rows = [
+            [(v, _visible_len(v)) for v in map(str, row[:n_cols])] if row is not None else None
+            for row in self.rows
+        ]
+
+        header_info = []
+        for c in self.columns:
             val = c["name"]
             if c["style"]:
                 val = f"[{c['style']}]{val}[/{c['style']}]"
+            header_info.append((val, len(c["name"])))
 
-            p_val = strip_tags(val)
-            pad = w - len(p_val)
-            if c["justify"] == "right":
-                header_cells.append((" " * pad) + val)
-            else:
-                header_cells.append(val + (" " * pad))
-
-        lines.append(" | ".join(header_cells))
-        lines.append("-+-".join("-" * w for w in col_widths))
-
-        for row in self.rows:
-            if row is None:
-                lines.append("-+-".join("-" * w for w in col_widths))
-                continue
-
-            row_cells = []
-            for i, col_val in enumerate(row):
-                if i >= len(self.columns):
-                    break
-                w = col_widths[i]
-                c = self.columns[i]
-                val = str(col_val)
-                p_val = strip_tags(val)
-                pad = w - len(p_val)
-                if c["justify"] == "right":
-                    row_cells.append((" " * pad) + val)
-                else:
-                    row_cells.append(val + (" " * pad))
-            lines.append(" | ".join(row_cells))
-        return "\n".join(lines)
+        # Transpose to columns once and let the C-level max() reduce each column
+        col_widths = [plen for _, plen in header_info]
+        body = [cells for cells in processed_rows if cells is not None]
+        for i, col in enumerate(zip_longest(*body, fillvalue=("", 0))):
+            col_widths[i] = max(col_widths[i], max(map(_VISIBLE_LEN, col)))
+
+        right = [c["justify"] == "right" for c in self.columns]
+        separator = "-+-".join("-" * w for w in col_widths)
+
+        if self.title:
+            yield self.title
+        yield _format_row(header_info, col_widths, right)
+        yield separator
+        for cells in processed_rows:
+            yield separator if cells is None else _format_row(cells, col_widths, right)
+
+
+def _format_row(cells: list[tuple[str, int]], col_widths: list[int], right: list[bool]) -> str:
+    """Join (value, visible length) cells into one padded table line."""
+    # Pad to the visible width; markup bytes do not take up columns
+    return " | ".join(
+        val.rjust(w + len(val) - plen) if r else val.ljust(w + len(val) - plen)
+        # Rows may be shorter than the header
+        for (val, plen), w, r in zip(cells, col_widths, right, strict=False)
+    )
 
 
 class Tree:
+    __slots__ = ("label", "children")
+
     def __init__(self, label: str):
         self.label = label
         self.children: list[Tree] = []
@@ -128,17 +173,23 @@ class Tree:
         self.children.append(t)
         return t
 
-    def _render(self, prefix: str = "", is_last: bool = True, is_root: bool = True) -> list[str]:
+    def _render(self) -> list[str]:
+        # Iterative depth-first walk; deep account hierarchies would otherwise pay
+        # one Python frame per node
         lines = []
-        if is_root:
-            lines.append(self.label)
-        else:
-            lines.append(prefix + ("└── " if is_last else "├── ") + self.label)
-            prefix += "    " if is_last else "│   "
-
-        for i, child in enumerate(self.children):
-            child_is_last = i == len(self.children) - 1
-            lines.extend(child._render(prefix, child_is_last, is_root=False))
+        stack: list[tuple[Tree, str, bool, bool]] = [(self, "", True, True)]
+        while stack:
+            node, prefix, is_last, is_root = stack.pop()
+            if is_root:
+                lines.append(node.label)
+                child_prefix = prefix
+            else:
+                lines.append(prefix + ("└── " if is_last else "├── ") + node.label)
+                child_prefix = prefix + ("    " if is_last else "│   ")
+
+            # Push in reverse so children pop in their original order
+            for i, child in enumerate(reversed(node.children)):
+                stack.append((child, child_prefix, i == 0, False))
         return lines
 
     def __str__(self):
@@ -179,15 +230,13 @@ def render_output(
         if not data_list:
             return
 
-        output = io.StringIO()
+        # Stream rows straight to the output instead of buffering the whole document
         fieldnames = list(data_list[0].keys())
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
+        writer = csv.DictWriter(_get_file(out_console), fieldnames=fieldnames)
         writer.writeheader()
 
         for row in data_list:
             writer.writerow({k: str(v) if v is not None else "" for k, v in row.items()})
-
-        out_console.print(output.getvalue().strip())
         return
 
     # default to table format
@@ -216,18 +265,22 @@ def render_output(
             style = "green"
         table.add_column(key, style=style)
 
-    for row in data_list:
-        table_row = []
-        for k, v in row.items():
-            val = str(v) if v is not None else ""
-
-            # Smart truncation for list tables
-            # Don't truncate accounts or IDs
-            if "Account" not in k and "ID" not in k and "id" not in k and "Date" not in k:
-                strip_val = strip_tags(val)
-                if len(strip_val) > 40:
-                    val = truncate_cell(val, 40)
-            table_row.append(val)
-        table.add_row(*table_row)
+    # Build the table column by column: the truncation rule depends only on the header,
+    # so it is decided once per column instead of once per cell
+    columns = []
+    for key in headers:
+        col = ["" if (v := row.get(key)) is None else str(v) for row in data_list]
+
+        # Smart truncation for list tables
+        # Don't truncate accounts or IDs
+        if "Account" not in key and "ID" not in key and "id" not in key and "Date" not in key:
+            # Truncate the visible text so a cut never lands inside a markup tag
+            for i, val in enumerate(col):
+                if len(val) > 40:
+                    stripped = strip_tags(val)
+                    if len(stripped) > 40:
+                        col[i] = truncate_cell(stripped, 40)
+        columns.append(col)
+    table.add_rows_columnar(columns)
 
     out_console.print(table)
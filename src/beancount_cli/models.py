@@ -1,48 +1,93 @@
 import datetime
 import re
 from decimal import Decimal
+from functools import lru_cache
 from typing import TYPE_CHECKING, Annotated, Any
 
-from pydantic import AfterValidator, BaseModel, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    ValidatorFunctionWrapHandler,
+    WrapValidator,
+)
+from pydantic.dataclasses import dataclass
+
+_ACCOUNT_RE = re.compile(r"^[A-Z][A-Za-z0-9\-]*(?::[A-Z0-9][A-Za-z0-9\-]*)+\Z")
+_CURRENCY_RE = re.compile(r"^[A-Z][A-Z0-9\'\.\_\-]{0,22}[A-Z0-9]\Z")
+
+
+@lru_cache(maxsize=1024)
+def _checked_account_name(v: str) -> "AccountName":
+    """
+    Regex-check `v` and wrap it. Bounded cache: a recently seen name returns the same
+    value object without re-matching, the str-subclass stand-in for sys.intern (which
+    rejects subclasses). Raised errors are never cached.
+    """
+    # The compiled pattern outperforms a split()/isalnum() scanner on account-length
+    # strings and, unlike str.isalnum(), stays ASCII-only
+    if not _ACCOUNT_RE.match(v):
+        raise ValueError(f"Invalid account name format: {v}")
+    return AccountName(v)
+
+
+@lru_cache(maxsize=1024)
+def _checked_currency_code(v: str) -> "CurrencyCode":
+    """Regex-check `v` and wrap it; bounded and success-only like _checked_account_name."""
+    if not _CURRENCY_RE.match(v):
+        raise ValueError(f"Invalid currency code format: {v}")
+    return CurrencyCode(v)
 
 
 def validate_account_name(v: Any) -> str:
     """Validation logic for AccountName."""
+    if type(v) is AccountName:
+        # Already validated (or built from parsed ledger data)
+        return v
     if not isinstance(v, str):
         raise TypeError("string required")
-    if not re.match(r"^[A-Z][A-Za-z0-9\-]*(?::[A-Z0-9][A-Za-z0-9\-]*)+$", v):
-        raise ValueError(f"Invalid account name format: {v}")
-    return v
+    return _checked_account_name(v)
 
 
 def validate_currency_code(v: Any) -> str:
     """Validation logic for CurrencyCode."""
+    if type(v) is CurrencyCode:
+        return v
     if not isinstance(v, str):
         raise TypeError("string required")
-    if not re.match(r"^[A-Z][A-Z0-9\'\.\_\-]{0,22}[A-Z0-9]$", v):
-        raise ValueError(f"Invalid currency code format: {v}")
-    return v
+    return _checked_currency_code(v)
+
+
+def _wrap_account_name(v: Any, handler: ValidatorFunctionWrapHandler) -> str:
+    # Pass value objects through untouched; the str core validator would
+    # otherwise downcast them before the regex check
+    return v if type(v) is AccountName else validate_account_name(handler(v))
+
+
+def _wrap_currency_code(v: Any, handler: ValidatorFunctionWrapHandler) -> str:
+    return v if type(v) is CurrencyCode else validate_currency_code(handler(v))
 
 
 class AccountName(str):
     """Value Object for Beancount Account Names."""
 
     if TYPE_CHECKING:
-        Input = Annotated[str | "AccountName", AfterValidator(validate_account_name)]
+        Input = Annotated[str | "AccountName", WrapValidator(_wrap_account_name)]
     else:
-        Input = Annotated[str, AfterValidator(validate_account_name)]
+        Input = Annotated[str, WrapValidator(_wrap_account_name)]
 
 
 class CurrencyCode(str):
     """Value Object for Beancount Currency Codes."""
 
     if TYPE_CHECKING:
-        Input = Annotated[str | "CurrencyCode", AfterValidator(validate_currency_code)]
+        Input = Annotated[str | "CurrencyCode", WrapValidator(_wrap_currency_code)]
     else:
-        Input = Annotated[str, AfterValidator(validate_currency_code)]
+        Input = Annotated[str, WrapValidator(_wrap_currency_code)]
 
 
-class AmountModel(BaseModel):
+@dataclass(slots=True, frozen=True)
+class AmountModel:
     """
     Represents a beancount.core.amount.Amount.
     """
@@ -51,7 +96,8 @@ class AmountModel(BaseModel):
     currency: CurrencyCode.Input
 
 
-class CostModel(BaseModel):
+@dataclass(slots=True, frozen=True)
+class CostModel:
     """
     Represents beancount.core.position.Cost (or CostSpec).
     """
@@ -67,6 +113,8 @@ class PostingModel(BaseModel):
     Represents a beancount.core.data.Posting.
     """
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     account: AccountName.Input
     units: AmountModel
     cost: CostModel | None = None
@@ -74,22 +122,40 @@ class PostingModel(BaseModel):
     flag: str | None = None
     meta: dict[str, Any] = Field(default_factory=dict)
 
+    @classmethod
+    def from_trusted(cls, **data: Any) -> "PostingModel":
+        """
+        Build a posting from already-validated data (e.g. beancount parser output)
+        without running validators.
+        """
+        return cls.model_construct(**data)
+
 
 class TransactionModel(BaseModel):
     """
     Represents a beancount.core.data.Transaction.
     """
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     date: datetime.date
 
     flag: str = "*"
     payee: str | None = None
     narration: str
-    tags: set[str] = Field(default_factory=set)
-    links: set[str] = Field(default_factory=set)
+    tags: frozenset[str] = Field(default_factory=frozenset)
+    links: frozenset[str] = Field(default_factory=frozenset)
     postings: list[PostingModel]
     meta: dict[str, Any] = Field(default_factory=dict)
 
+    @classmethod
+    def from_trusted(cls, **data: Any) -> "TransactionModel":
+        """
+        Build a transaction from already-validated data (e.g. beancount parser output)
+        without running validators.
+        """
+        return cls.model_construct(**data)
+
 
 class AccountModel(BaseModel):
     """
@@ -1,11 +1,21 @@
+import glob
+import os
+import re
 import sys
-from datetime import date
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from decimal import Decimal
+from fnmatch import fnmatch
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
-from beancount import loader
-from beancount.core import data
+from beancount import Amount, loader
+from beancount.core import convert, data, realization
+from beancount.core import prices as prices_lib
+from beancount.core.inventory import Inventory
 from beancount.parser import printer
 
 from beancount_cli.adapters import from_core_transaction, to_core_balance, to_core_transaction
@@ -14,19 +24,144 @@ from beancount_cli.models import (
     BalanceModel,
     CommodityModel,
     CurrencyCode,
+    PostingModel,
     PriceGapModel,
     TransactionModel,
     UndeclaredCommodityModel,
 )
 
+_E = TypeVar("_E")
+
+# `include "path"` lines, scanned as raw bytes so the include tree never needs a full
+# parse and only the captured paths are ever decoded
+_INCLUDE_RE = re.compile(rb'^\s*include\s+"([^"]+)"', re.MULTILINE)
+
+
+class _SlugTranslation(dict):
+    """
+    str.translate table keeping alphanumerics (any script), "_" and "-".
+    Code points are classified on first sight and cached, so translate stays in C.
+    """
+
+    def __missing__(self, code: int) -> int | None:
+        c = chr(code)
+        kept = code if c.isalnum() or c in "_-" else None
+        self[code] = kept
+        return kept
+
+
+_SLUG_TABLE = _SlugTranslation()
+
+# Filter patterns repeat across list_transactions calls; re.compile returns Pattern inputs as-is
+_compile_filter = lru_cache(maxsize=256)(re.compile)
+
+# Parsed ledgers keyed by resolved root path. Each entry keeps the files the load read and
+# their (mtime_ns, size) stamps, so an edit to the root or any include invalidates it.
+# It also keeps every include pattern with the files it expanded to: a file created
+# under an `include "inbox/*.beancount"` glob, or a missing include target appearing,
+# changes an expansion without touching any stamped file.
+# Kept in least-recently-used order and capped, so long-lived processes (test sessions
+# creating many temporary ledgers) do not hold on to every parse.
+_LEDGER_CACHE: dict[
+    str,
+    tuple[
+        list[str],
+        tuple[tuple[int, int], ...] | None,
+        tuple[str, ...],
+        tuple[tuple[str, ...], ...],
+        tuple[list, list, dict],
+    ],
+] = {}
+_LEDGER_CACHE_SIZE = 32
+
+
+def _include_patterns(files: list[str]) -> tuple[str, ...]:
+    """Return the search pattern of every include directive in `files`, as beancount builds it."""
+    patterns = []
+    for f in files:
+        try:
+            with open(f, "rb") as fh:
+                content = fh.read()
+        except OSError:
+            continue
+        cwd = os.path.dirname(f)
+        for match in _INCLUDE_RE.finditer(content):
+            # join() keeps absolute include paths as they are
+            patterns.append(os.path.join(cwd, match.group(1).decode("utf-8")))
+    return tuple(patterns)
+
+
+def _expand_includes(patterns: tuple[str, ...]) -> tuple[tuple[str, ...], ...]:
+    """Expand include patterns the way beancount's loader does (recursive glob)."""
+    return tuple(tuple(sorted(glob.glob(p, recursive=True))) for p in patterns)
+
+
+def _file_stamps(paths: list[str]) -> tuple[tuple[int, int], ...] | None:
+    """Return (mtime_ns, size) for each path, or None if any of them is gone."""
+    stamps = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except FileNotFoundError:
+            return None
+        stamps.append((st.st_mtime_ns, st.st_size))
+    return tuple(stamps)
+
+
+@lru_cache(maxsize=256)
+def _parse_bql_ids(where: str) -> Any:
+    """
+    Parse `SELECT id WHERE <where>` once per distinct filter. Compilation binds the
+    current ledger's table, so only the parsed AST is cached; parse errors are not.
+    """
+    from beanquery import parser  # type: ignore
+
+    return parser.parse(f"SELECT id WHERE {where}")
+
+
+def _append_entry(path: Path, entry_str: str, newline_if_empty: bool = True) -> None:
+    """
+    Append a formatted entry, preceded by a newline, through one O_APPEND descriptor.
+    Each os.write lands at the current end of file, so entries from concurrent
+    invocations do not interleave. With newline_if_empty=False an empty or new file
+    gets no leading newline.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        if not newline_if_empty and os.fstat(fd).st_size == 0:
+            buf = entry_str.encode("utf-8")
+        else:
+            buf = ("\n" + entry_str).encode("utf-8")
+        # os.write may write less than asked for (e.g. when interrupted)
+        while buf:
+            buf = buf[os.write(fd, buf) :]
+    finally:
+        os.close(fd)
+
 
 class LedgerService:
     def __init__(self, ledger_file: Path):
         self.ledger_file = ledger_file
-        self.entries: list[data.Directive] = []
-        self.errors: list[Any] = []
-        self.options: dict[str, Any] = {}
+        # Nothing is parsed until the ledger is first used; see the properties below
+        self._entries: list[data.Directive] = []
+        self._errors: list[Any] = []
+        self._options: dict[str, Any] = {}
         self._loaded = False
+        # Derived lookups, filled in by _index_entries() after each load
+        self._by_type: dict[type, list[Any]] = {}
+        self._cli_config: dict[Any, Any] = {}
+        self._accounts: list[str] = []
+        self._commodities: list[str] = []
+        self._account_set: frozenset[str] = frozenset()
+        self._commodity_set: frozenset[str] = frozenset()
+        self._op_currencies: list[str] = []
+        # Built lazily on first use, since only reports need them
+        self._real_root: Any = None
+        self._price_map: dict | None = None
+        self._subtree_balances: dict[str, Inventory] | None = None
+        # Transaction indexes for the exact-match filters, also built on first use
+        self._by_tag: dict[str, list[data.Transaction]] | None = None
+        self._by_currency: dict[str, list[data.Transaction]] | None = None
 
     def load(self):
         if self._loaded:
@@ -34,26 +169,178 @@ class LedgerService:
         if not self.ledger_file.exists():
             raise FileNotFoundError(f"Ledger file not found: {self.ledger_file}")
 
-        # Load the file
-        self.entries, self.errors, self.options = loader.load_file(str(self.ledger_file))
+        # Keyed on the real file, but parsed under the given path: beancount records that
+        # path in every directive's meta["filename"], so a hit must have used the same one
+        path = str(self.ledger_file)
+        key = str(self.ledger_file.resolve())
+        cached = _LEDGER_CACHE.pop(key, None)
+        if (
+            cached is not None
+            and cached[4][2]["filename"] == os.path.abspath(path)
+            and _file_stamps(cached[0]) == cached[1]
+            and _expand_includes(cached[2]) == cached[3]
+        ):
+            # Re-insert to mark it most recently used
+            _LEDGER_CACHE[key] = cached
+            result = cached[4]
+        else:
+            before = _file_stamps([path])
+            result = loader.load_file(path)
+            files = list(result[2].get("include") or [path])
+            patterns = _include_patterns(files)
+            stamps = _file_stamps(files)
+            # A write landing mid-parse would pair a stale result with fresh stamps
+            if stamps is not None and _file_stamps([path]) == before:
+                _LEDGER_CACHE[key] = (
+                    files,
+                    stamps,
+                    patterns,
+                    _expand_includes(patterns),
+                    result,
+                )
+                if len(_LEDGER_CACHE) > _LEDGER_CACHE_SIZE:
+                    del _LEDGER_CACHE[next(iter(_LEDGER_CACHE))]
+
+        # The cached result is shared by every instance, so each one gets its own entry
+        # list and its own copies of the option lists, sets and dicts. The directives
+        # (including their meta dicts) and other option objects such as dcontext are
+        # still shared and must be treated as read-only.
+        entries, errors, options = result
+        self._entries, self._errors = list(entries), list(errors)
+        self._options = {
+            k: v.copy() if isinstance(v, list | set | dict) else v for k, v in options.items()
+        }
+        self._index_entries()
         self._loaded = True
 
+    def reload(self):
+        """Re-read the ledger after a write, bypassing the shared parse cache."""
+        _LEDGER_CACHE.pop(str(self.ledger_file.resolve()), None)
+        self._loaded = False
+        self.load()
+
+    @property
+    def entries(self) -> list[data.Directive]:
+        if not self._loaded:
+            self.load()
+        return self._entries
+
+    @property
+    def errors(self) -> list[Any]:
+        if not self._loaded:
+            self.load()
+        return self._errors
+
+    @property
+    def options(self) -> dict[str, Any]:
+        if not self._loaded:
+            self.load()
+        return self._options
+
+    def _index_entries(self) -> None:
+        # Bucket entries by concrete type in one pass so lookups by directive type
+        # do not rescan the whole ledger; buckets keep the ledger's date order
+        by_type: dict[type, list[Any]] = {}
+        for e in self._entries:
+            by_type.setdefault(type(e), []).append(e)
+        self._by_type = by_type
+
+        self._accounts = sorted(e.account for e in by_type.get(data.Open, []))
+        self._commodities = sorted(e.currency for e in by_type.get(data.Commodity, []))
+        self._account_set = frozenset(self._accounts)
+        self._commodity_set = frozenset(self._commodities)
+        self._op_currencies = self._options.get("operating_currency", [])
+
+        # Later cli-config directives override earlier ones
+        config: dict[Any, Any] = {}
+        for e in by_type.get(data.Custom, []):
+            if e.type != "cli-config" or len(e.values) < 2:
+                continue
+
+            val_key = e.values[0]
+            val_value = e.values[1]
+
+            # Beancount parser returns strings in custom directives as str,
+            # but sometimes wrapped. Check for .value attribute just in case.
+            if hasattr(val_key, "value"):
+                val_key = val_key.value
+            if hasattr(val_value, "value"):
+                val_value = val_value.value
+
+            config[val_key] = val_value
+        self._cli_config = config
+        self._real_root = None
+        self._price_map = None
+        self._subtree_balances = None
+        self._by_tag = None
+        self._by_currency = None
+
+    def entries_of(self, entry_type: type[_E]) -> list[_E]:
+        """
+        Return the loaded entries of exactly `entry_type`, in ledger order.
+        """
+        if not self._loaded:
+            self.load()
+        return self._by_type.get(entry_type, [])
+
+    def transactions_with_tag(self, tag: str) -> list[data.Transaction]:
+        """
+        Return the transactions tagged `tag`, in ledger order.
+        """
+        if not self._loaded:
+            self.load()
+        if self._by_tag is None:
+            by_tag: dict[str, list[data.Transaction]] = {}
+            for tx in self.entries_of(data.Transaction):
+                for t in tx.tags or ():
+                    by_tag.setdefault(t, []).append(tx)
+            self._by_tag = by_tag
+        return self._by_tag.get(tag, [])
+
+    def transactions_with_currency(self, currency: str) -> list[data.Transaction]:
+        """
+        Return the transactions with a posting in `currency` units, in ledger order.
+        """
+        if not self._loaded:
+            self.load()
+        if self._by_currency is None:
+            by_currency: dict[str, list[data.Transaction]] = {}
+            for tx in self.entries_of(data.Transaction):
+                for c in {p.units.currency for p in tx.postings if p.units}:
+                    by_currency.setdefault(c, []).append(tx)
+            self._by_currency = by_currency
+        return self._by_currency.get(currency, [])
+
     def get_operating_currencies(self) -> list[str]:
         if not self._loaded:
             self.load()
-        return self.options.get("operating_currency", [])
+        return self._op_currencies
 
     def get_accounts(self) -> list[str]:
         if not self._loaded:
             self.load()
-        # Extract open directives to get accounts, or use realization?
-        # A simple set comprehension over Open directives is fast.
-        return sorted([e.account for e in self.entries if isinstance(e, data.Open)])
+        return self._accounts
 
     def get_commodities(self) -> list[str]:
         if not self._loaded:
             self.load()
-        return sorted([e.currency for e in self.entries if isinstance(e, data.Commodity)])
+        return self._commodities
+
+    def get_account_set(self) -> frozenset[str]:
+        """
+        Return the opened accounts as a set, for membership checks.
+        """
+        if not self._loaded:
+            self.load()
+        return self._account_set
+
+    def get_commodity_set(self) -> frozenset[str]:
+        """
+        Return the declared commodities as a set, for membership checks.
+        """
+        if not self._loaded:
+            self.load()
+        return self._commodity_set
 
     def get_used_currencies(self) -> set[str]:
         """
@@ -62,15 +349,14 @@ class LedgerService:
         if not self._loaded:
             self.load()
         used = set()
-        for e in self.entries:
-            if isinstance(e, data.Transaction):
-                for p in e.postings:
-                    if p.units:
-                        used.add(p.units.currency)
-                    if p.cost and p.cost.currency:
-                        used.add(p.cost.currency)
-                    if p.price and p.price.currency:
-                        used.add(p.price.currency)
+        for e in self.entries_of(data.Transaction):
+            for p in e.postings:
+                if p.units:
+                    used.add(p.units.currency)
+                if p.cost and p.cost.currency:
+                    used.add(p.cost.currency)
+                if p.price and p.price.currency:
+                    used.add(p.price.currency)
         return used
 
     def get_inventory(self, at_date: date) -> set[str]:
@@ -79,17 +365,13 @@ class LedgerService:
         """
         if not self._loaded:
             self.load()
-        from beancount.core import convert
-        from beancount.core.inventory import Inventory
-
         inv = Inventory()
-        for e in self.entries:
+        for e in self.entries_of(data.Transaction):
             if e.date > at_date:
                 break
-            if isinstance(e, data.Transaction):
-                for p in e.postings:
-                    if p.account.startswith(("Assets", "Liabilities")):
-                        inv.add_position(p)
+            for p in e.postings:
+                if p.account.startswith(("Assets", "Liabilities")):
+                    inv.add_position(p)
 
         return {
             pos.units.currency
@@ -100,9 +382,43 @@ class LedgerService:
     def get_price_map(self) -> dict:
         if not self._loaded:
             self.load()
-        from beancount.core import prices
+        if self._price_map is None:
+            self._price_map = prices_lib.build_price_map(self.entries)
+        return self._price_map
 
-        return prices.build_price_map(self.entries)
+    def get_real_root(self) -> Any:
+        """
+        Return the realized account tree of the loaded entries, building it on first use.
+        """
+        if not self._loaded:
+            self.load()
+        if self._real_root is None:
+            self._real_root = realization.realize(self.entries)
+        return self._real_root
+
+    def get_subtree_balances(self) -> dict[str, Inventory]:
+        """
+        Return {account: balance including all sub-accounts} ("" is the root), the
+        values realization.compute_balance() gives, summed once bottom-up per load.
+        """
+        if self._subtree_balances is None:
+            order = []
+            stack = [self.get_real_root()]
+            while stack:
+                node = stack.pop()
+                order.append(node)
+                stack.extend(reversed(node.values()))
+
+            balances: dict[str, Inventory] = {}
+            # Reverse pre-order visits every child before its parent
+            for node in reversed(order):
+                inv = Inventory()
+                inv.add_inventory(node.balance)
+                for child in node.values():
+                    inv.add_inventory(balances[child.account])
+                balances[node.account] = inv
+            self._subtree_balances = balances
+        return self._subtree_balances
 
     def get_custom_config(self, key: str) -> str | None:
         """
@@ -110,24 +426,7 @@ class LedgerService:
         """
         if not self._loaded:
             self.load()
-        for e in reversed(self.entries):
-            if isinstance(e, data.Custom) and e.type == "cli-config":
-                if len(e.values) < 2:
-                    continue
-
-                val_key = e.values[0]
-                val_value = e.values[1]
-
-                # Beancount parser returns strings in custom directives as str,
-                # but sometimes wrapped. Check for .value attribute just in case.
-                if hasattr(val_key, "value"):
-                    val_key = val_key.value
-                if hasattr(val_value, "value"):
-                    val_value = val_value.value
-
-                if val_key == key:
-                    return val_value
-        return None
+        return self._cli_config.get(key)
 
 
 class ValidationService:
@@ -136,8 +435,8 @@ class ValidationService:
 
     def validate_transaction(self, tx: TransactionModel) -> list[str]:
         errors = []
-        valid_accounts = set(self.ledger.get_accounts())
-        valid_commodities = set(self.ledger.get_commodities())
+        valid_accounts = self.ledger.get_account_set()
+        valid_commodities = self.ledger.get_commodity_set()
 
         for p in tx.postings:
             if p.account not in valid_accounts:
@@ -152,11 +451,17 @@ class ValidationService:
 
         return errors
 
+    def validate_many(self, txs: list[TransactionModel]) -> list[list[str]]:
+        """
+        Validate a batch of transactions, returning one error list per transaction.
+        """
+        return [self.validate_transaction(tx) for tx in txs]
+
 
 class TransactionService:
-    def __init__(self, ledger_file: Path):
+    def __init__(self, ledger_file: Path, ledger_service: LedgerService | None = None):
         self.ledger_file = ledger_file
-        self.ledger_service = LedgerService(ledger_file)
+        self.ledger_service = ledger_service or LedgerService(ledger_file)
         self.validator = ValidationService(self.ledger_service)
 
     # ... list_transactions ... (omitted from replace chunk to keep it small?
@@ -166,35 +471,46 @@ class TransactionService:
 
     def list_transactions(
         self,
-        account_regex: str | None = None,
-        payee_regex: str | None = None,
+        account_regex: str | re.Pattern[str] | None = None,
+        payee_regex: str | re.Pattern[str] | None = None,
         tag: str | None = None,
         currency: CurrencyCode.Input | None = None,
         bql_where: str | None = None,
     ) -> list[TransactionModel]:
-        self.ledger_service.load()
-        entries = self.ledger_service.entries
-        txs = [e for e in entries if isinstance(e, data.Transaction)]
-
-        filtered_txs = []
-        import re
-
-        for tx in txs:
-            match = True
-            if account_regex:
-                if not any(re.search(account_regex, p.account) for p in tx.postings):
-                    match = False
-            if match and payee_regex:
-                if not (tx.payee and re.search(payee_regex, tx.payee)):
-                    match = False
-            if match and tag:
-                if not (tx.tags and tag in tx.tags):
-                    match = False
-            if match and currency:
-                if not any(p.units and p.units.currency == currency for p in tx.postings):
-                    match = False
-            if match:
-                filtered_txs.append(tx)
+        # Exact-match filters start from a ledger index instead of every transaction;
+        # the tag index is used when both are given, and currency stays a predicate
+        if tag:
+            txs = self.ledger_service.transactions_with_tag(tag)
+        elif currency:
+            txs = self.ledger_service.transactions_with_currency(currency)
+        else:
+            txs = self.ledger_service.entries_of(data.Transaction)
+
+        # Only the filters actually requested become predicates, so the per-transaction
+        # work never re-checks flags that are fixed for the whole call. Each predicate runs
+        # as a C-level filter() pass over the survivors of the previous one.
+        preds: list[Callable[[data.Transaction], Any]] = []
+        if account_regex:
+            # Compile once instead of going through re's pattern cache per posting
+            acc_search = _compile_filter(account_regex).search
+            preds.append(lambda tx: any(map(acc_search, [p.account for p in tx.postings])))
+        if payee_regex:
+            payee_search = _compile_filter(payee_regex).search
+            preds.append(lambda tx: tx.payee and payee_search(tx.payee))
+        if tag and currency:
+
+            def has_currency(tx: data.Transaction) -> bool:
+                # A plain loop beats any(<generator>) on the short postings lists here
+                for p in tx.postings:
+                    if p.units and p.units.currency == currency:
+                        return True
+                return False
+
+            preds.append(has_currency)
+
+        filtered_txs = txs
+        for pred in preds:
+            filtered_txs = list(filter(pred, filtered_txs))
 
         if bql_where:
             try:
@@ -214,16 +530,38 @@ class TransactionService:
 
                 cursor = conn.cursor()
                 # We use the 'id' column which refers to the parent transaction hash
-                cursor.execute(f"SELECT id WHERE {bql_where}")
+                cursor.execute(_parse_bql_ids(bql_where))
                 ids = {r[0] for r in cursor.fetchall()}
 
-                # Apply BQL IDs to current filtered list
-                filtered_txs = [tx for tx in filtered_txs if hash_entry(tx) in ids]
+                # Apply BQL IDs to current filtered list; hashing is the costly part, so
+                # skip it when the query matched nothing. (A hash -> tx dict would merge
+                # identical transactions, which share a hash.)
+                if ids:
+                    filtered_txs = [tx for tx in filtered_txs if hash_entry(tx) in ids]
+                else:
+                    filtered_txs = []
             except (ImportError, SyntaxError, ValueError, ParseError) as e:
                 raise ValueError(f"BQL query failed: {e}") from e
 
         return [from_core_transaction(tx) for tx in filtered_txs]
 
+    def list_currency_postings(
+        self, currency: CurrencyCode.Input
+    ) -> list[tuple[TransactionModel, list[PostingModel]]]:
+        """
+        Return transactions touching `currency`, each paired with its postings in that currency.
+        """
+        return [
+            (tx, [p for p in tx.postings if p.units.currency == currency])
+            for tx in self.list_transactions(currency=currency)
+        ]
+
+    def format_transaction(self, tx: TransactionModel) -> str:
+        """
+        Return the ledger text for a transaction, exactly as add_transaction writes it.
+        """
+        return printer.format_entry(to_core_transaction(tx))
+
     def add_transaction(
         self,
         tx: TransactionModel,
@@ -234,10 +572,8 @@ class TransactionService:
         """
         Add a transaction to the ledger.
         """
-        if draft:
-            tx.flag = "!"
-        else:
-            tx.flag = "*"
+        # Transactions are immutable; stamp the flag on a copy
+        tx = tx.model_copy(update={"flag": "!" if draft else "*"})
 
         # Validate
         errors = self.validator.validate_transaction(tx)
@@ -248,8 +584,7 @@ class TransactionService:
             else:
                 print(f"Warning: {error_msg}", file=sys.stderr)
 
-        core_tx = to_core_transaction(tx)
-        entry_str = printer.format_entry(core_tx)
+        entry_str = self.format_transaction(tx)
 
         if print_only:
             print(entry_str)
@@ -263,8 +598,6 @@ class TransactionService:
             # Resolve relative to ledger file
             # Format pattern with transaction data
             # variables: {year}, {month}, {day}, {slug}, {payee}
-            from datetime import datetime
-
             # Use transaction date if available, else today
             tx_date = tx.date
 
@@ -272,10 +605,8 @@ class TransactionService:
                 "year": tx_date.year,
                 "month": f"{tx_date.month:02d}",
                 "day": f"{tx_date.day:02d}",
-                "payee": "".join(c for c in (tx.payee or "unknown") if c.isalnum() or c in "_-"),
-                "slug": "".join(
-                    c for c in (tx.payee or tx.narration or "tx") if c.isalnum() or c in "_-"
-                ),
+                "payee": (tx.payee or "unknown").translate(_SLUG_TABLE),
+                "slug": (tx.payee or tx.narration or "tx").translate(_SLUG_TABLE),
             }
 
             try:
@@ -294,18 +625,16 @@ class TransactionService:
             if target_path.suffix:
                 # Ensure parent dirs exist
                 target_path.parent.mkdir(parents=True, exist_ok=True)
-                # Append mode for existing file or new file
-                mode = "a" if actual_target.exists() else "w"
-                with open(actual_target, mode) as f:
-                    if mode == "a":
-                        f.write("\n")
-                    f.write(entry_str)
+                # Creates a missing file; only separate from existing content
+                _append_entry(actual_target, entry_str, newline_if_empty=False)
                 print(f"Transaction appended to {actual_target}")
                 return
             else:
                 # Directory mode
                 target_path.mkdir(parents=True, exist_ok=True)
-                timestamp = datetime.now().strftime("%Y-%m-%dT%H%M%S%f")[:19]
+                # Seconds plus hundredths, e.g. 2024-01-31T23595912
+                now = datetime.now()
+                timestamp = f"{now:%Y-%m-%dT%H%M%S}{now.microsecond // 10000:02d}"
                 filename = f"{timestamp}_{placeholders['slug']}.beancount"
                 actual_target = target_path / filename
 
@@ -314,14 +643,20 @@ class TransactionService:
                 print(f"Transaction created in {actual_target}")
                 return
 
-        with open(actual_target, "a") as f:
-            f.write("\n" + entry_str)
+        _append_entry(actual_target, entry_str)
         print(f"Transaction appended to {actual_target}")
 
 
 class MapService:
+    """
+    Walks the include graph from the raw text of each file; never parses the ledger.
+    """
+
     def __init__(self, root_file: Path):
         self.root_file = root_file
+        # Glob results keyed by (pattern, directory mtime_ns); adding, removing or renaming
+        # a file bumps the directory mtime, so repeated walks only re-list changed dirs
+        self._glob_cache: dict[tuple[str, bool, int], list[Path]] = {}
 
     def get_include_tree(self) -> dict[str, Any]:
         """
@@ -329,53 +664,124 @@ class MapService:
         Returns a nested dict: { "file.beancount": { "subfile.beancount": {} } }
         """
         tree: dict[str, Any] = {}
-        with open(self.root_file, encoding="utf-8") as f:
-            content = f.read()
-
-        # Parse includes manually to avoid full loading overhead/flattening
-        import re
-
-        include_pattern = re.compile(r'^\s*include\s+"([^"]+)"', re.MULTILINE)
-
-        for match in include_pattern.finditer(content):
-            included_path_str = match.group(1)
-
-            # Handle globs
-            if "*" in included_path_str or "?" in included_path_str:
-                # Resolve parent dir and glob pattern
-                # Beancount includes are relative to the file containing the include
-                base_dir = self.root_file.parent
-
-                # If path is absolute (rare in beancount but possible)
-                if Path(included_path_str).is_absolute():
-                    # Glob on absolute path
-                    # This is tricky as glob needs a root.
-                    # Path(included_path_str).parent.glob(Path(included_path_str).name)
-                    parent = Path(included_path_str).parent
-                    pattern = Path(included_path_str).name
-                    matches = list(parent.glob(pattern))
-                else:
-                    # Relative glob
-                    # We need to construct the full path pattern
-                    # But glob() is a method on Path.
-                    # e.g. include "trades/*.beancount" -> base_dir.glob("trades/*.beancount")
-                    matches = list(base_dir.glob(included_path_str))
+        children = _scan_includes(self.root_file, self._glob_cache)
+        if not children:
+            return tree
+
+        # Walk the graph level by level: every file at one depth is read concurrently,
+        # and the tree is assembled on this thread in include order. Reads are I/O-bound,
+        # and workers never wait on each other, so a shared pool cannot deadlock.
+        level: list[tuple[dict[str, Any], Path, frozenset[Path]]] = [
+            (tree, self.root_file, frozenset({self.root_file.resolve()}))
+        ]
+        scans: Iterable[list[tuple[str, Path | None]]] = [children]
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            while level:
+                next_level = []
+                for (node, _, ancestors), includes in zip(level, scans, strict=True):
+                    for key, child in includes:
+                        sub: dict[str, Any] = {}
+                        node[key] = sub
+                        # Stop at include cycles instead of walking them forever
+                        if child is not None and child.resolve() not in ancestors:
+                            next_level.append((sub, child, ancestors | {child.resolve()}))
+                level = next_level
+                scans = pool.map(
+                    lambda path: _scan_includes(path, self._glob_cache),
+                    [path for _, path, _ in level],
+                )
 
-                if not matches:
-                    # Keep the glob pattern in tree to show it matched nothing
-                    tree[f"{included_path_str} (No matches)"] = {}
+        return tree
 
-                for m in sorted(matches):
-                    sub_service = MapService(m)
-                    tree[str(m)] = sub_service.get_include_tree()
 
-            else:
-                # Direct file
-                included_path = (self.root_file.parent / included_path_str).resolve()
-                sub_service = MapService(included_path)
-                tree[str(included_path)] = sub_service.get_include_tree()
+def _glob_includes(
+    base_dir: Path, pattern: str, cache: dict[tuple[str, bool, int], list[Path]] | None = None
+) -> list[Path]:
+    """
+    Expand an include glob relative to `base_dir` into the files it matches, as glob.glob
+    would. `base_dir` is taken literally; each wildcard component of `pattern` is matched
+    with one scandir pass (no stat per candidate), reused from `cache` while that directory
+    is unchanged. Like glob, wildcards skip dot-files unless the component starts with ".".
+    """
+    parts = Path(pattern).parts
+    if "**" in parts:
+        # Recursive patterns are rare; let glob handle them with the base escaped
+        escaped = os.path.join(glob.escape(str(base_dir)), pattern)
+        return [Path(p) for p in glob.glob(escaped, recursive=True) if os.path.isfile(p)]
+
+    paths = [base_dir]
+    for index, part in enumerate(parts):
+        if not any(c in part for c in "*?["):
+            paths = [p / part for p in paths]
+            continue
+        dirs_only = index < len(parts) - 1
+        paths = [m for p in paths for m in _match_component(p, part, dirs_only, cache)]
+    return [p for p in paths if p.is_file()]
+
+
+def _match_component(
+    directory: Path,
+    part: str,
+    dirs_only: bool,
+    cache: dict[tuple[str, bool, int], list[Path]] | None,
+) -> list[Path]:
+    """Entries of `directory` matching the wildcard `part`: subdirectories or files."""
+    try:
+        key = (str(directory / part), dirs_only, os.stat(directory).st_mtime_ns)
+        if cache is not None and key in cache:
+            return cache[key]
+        with os.scandir(directory) as it:
+            matches = [
+                directory / e.name
+                for e in it
+                if (part.startswith(".") or not e.name.startswith("."))
+                and fnmatch(e.name, part)
+                and (e.is_dir() if dirs_only else e.is_file())
+            ]
+    except OSError:
+        return []
+    if cache is not None:
+        cache[key] = matches
+    return matches
+
+
+def _scan_includes(
+    file: Path, glob_cache: dict[tuple[str, bool, int], list[Path]] | None = None
+) -> list[tuple[str, Path | None]]:
+    """
+    Return (tree key, file to descend into) for each include in `file`, in order.
+    A glob that matches nothing yields a placeholder key and no file.
+    """
+    with open(file, "rb") as f:
+        content = f.read()
+
+    includes: list[tuple[str, Path | None]] = []
+    # Parse includes manually to avoid full loading overhead/flattening
+    for match in _INCLUDE_RE.finditer(content):
+        included_path_str = match.group(1).decode("utf-8")
+
+        # Handle globs
+        if "*" in included_path_str or "?" in included_path_str:
+            # Resolve parent dir and glob pattern
+            # Beancount includes are relative to the file containing the include
+            base_dir = file.parent
+
+            # Absolute patterns (rare in beancount but possible) ignore base_dir
+            matches = _glob_includes(base_dir, included_path_str, glob_cache)
+
+            if not matches:
+                # Keep the glob pattern in tree to show it matched nothing
+                includes.append((f"{included_path_str} (No matches)", None))
+
+            for m in sorted(matches):
+                includes.append((str(m), m))
 
-        return tree
+        else:
+            # Direct file
+            included_path = (file.parent / included_path_str).resolve()
+            includes.append((str(included_path), included_path))
+
+    return includes
 
 
 class ReportService:
@@ -392,44 +798,45 @@ class ReportService:
         Return {account: {"units": {curr: amt}, "cost": {curr: amt}}},
         optionally filtered, converted, and valued.
         """
-        self.ledger.load()
-        from beancount.core import prices as prices_lib
-        from beancount.core import realization
-
-        real_root = realization.realize(self.ledger.entries)
+        # Shared with every other report on this ledger; get_holdings alone
+        # asks for balances 1 + 2 * len(target_currencies) times
+        real_root = self.ledger.get_real_root()
+        subtree_balances = self.ledger.get_subtree_balances()
 
         # Build price map if conversion needed
         prices = None
         if convert_to:
-            prices = prices_lib.build_price_map(self.ledger.entries)
+            prices = self.ledger.get_price_map()
 
         balances = {}
+        # Operating currencies for transitive conversion (e.g. PPFD -> EUR -> USD)
+        via_currencies = self.ledger.get_operating_currencies()
+        zero = Decimal(0)
 
-        def traverse(node):
-            # Compute cumulative balance
-            cb = realization.compute_balance(node)
+        def visit(node):
+            # Cumulative balance, precomputed once per load
+            cb = subtree_balances[node.account]
             if not cb.is_empty():
                 units = {}
                 cost = {}
 
                 if convert_to:
-                    # Valuation logic
-                    total_converted = Decimal(0)
+                    # Valuation logic. Partition once: positions already in the target
+                    # currency are summed directly (added once, never also converted);
+                    # only the rest go through the conversion machinery.
+                    to_convert = []
+                    in_target = []
                     for pos in cb:
-                        # Get operating currencies for transitive conversion
-                        # (e.g. PPFD -> EUR -> USD)
-                        via_currencies = self.ledger.get_operating_currencies()
-
                         if pos.units.currency == convert_to:
-                            # Already in target currency: add once (do not also convert)
-                            total_converted += pos.units.number
-                            continue
+                            in_target.append(pos.units.number)
+                        else:
+                            to_convert.append(pos)
+                    total_converted = sum(in_target, zero)
 
+                    for pos in to_convert:
                         if valuation == "market":
                             # Use beancount.core.convert for robust conversion
                             # (handles indirect paths)
-                            from beancount.core import convert
-
                             try:
                                 converted_amt = convert.convert_amount(
                                     pos.units, convert_to, prices, via=via_currencies
@@ -442,8 +849,6 @@ class ReportService:
                                         total_converted += pos.units.number * pos.cost.number
                                     elif pos.cost:
                                         # Try converting cost to target
-                                        from beancount import Amount
-
                                         cost_amt = Amount(
                                             pos.units.number * pos.cost.number, pos.cost.currency
                                         )
@@ -454,8 +859,7 @@ class ReportService:
                                             total_converted += converted_cost.number
                                     else:
                                         units[pos.units.currency] = (
-                                            units.get(pos.units.currency, Decimal(0))
-                                            + pos.units.number
+                                            units.get(pos.units.currency, zero) + pos.units.number
                                         )
                             except (KeyError, TypeError) as e:
                                 raise ValueError(
@@ -463,11 +867,7 @@ class ReportService:
                                 ) from e
                         elif valuation == "cost":
                             # Cost valuation
-                            from beancount.core import convert
-
                             if pos.cost:
-                                from beancount import Amount
-
                                 cost_amt = Amount(
                                     pos.units.number * pos.cost.number, pos.cost.currency
                                 )
@@ -479,8 +879,7 @@ class ReportService:
                                         total_converted += converted_cost.number
                                     else:
                                         units[pos.units.currency] = (
-                                            units.get(pos.units.currency, Decimal(0))
-                                            + pos.units.number
+                                            units.get(pos.units.currency, zero) + pos.units.number
                                         )
                                 except (KeyError, TypeError) as e:
                                     raise ValueError(
@@ -497,8 +896,7 @@ class ReportService:
                                         total_converted += converted_units.number
                                     else:
                                         units[pos.units.currency] = (
-                                            units.get(pos.units.currency, Decimal(0))
-                                            + pos.units.number
+                                            units.get(pos.units.currency, zero) + pos.units.number
                                         )
                                 except (KeyError, TypeError) as e:
                                     raise ValueError(
@@ -507,37 +905,39 @@ class ReportService:
                         else:
                             # Not convertible under this valuation
                             units[pos.units.currency] = (
-                                units.get(pos.units.currency, Decimal(0)) + pos.units.number
+                                units.get(pos.units.currency, zero) + pos.units.number
                             )
 
                     if total_converted != 0:
-                        units[convert_to] = units.get(convert_to, Decimal(0)) + total_converted
-                        cost[convert_to] = cost.get(convert_to, Decimal(0)) + total_converted
+                        units[convert_to] = units.get(convert_to, zero) + total_converted
+                        cost[convert_to] = cost.get(convert_to, zero) + total_converted
                 else:
                     # Standard logic
                     for pos in cb:
                         u_curr = pos.units.currency
-                        units[u_curr] = units.get(u_curr, Decimal(0)) + pos.units.number
+                        units[u_curr] = units.get(u_curr, zero) + pos.units.number
 
                         if pos.cost and pos.cost.number is not None:
                             c_curr = pos.cost.currency
-                            cost[c_curr] = cost.get(c_curr, Decimal(0)) + (
+                            cost[c_curr] = cost.get(c_curr, zero) + (
                                 pos.units.number * pos.cost.number
                             )
                         else:
-                            cost[u_curr] = cost.get(u_curr, Decimal(0)) + pos.units.number
+                            cost[u_curr] = cost.get(u_curr, zero) + pos.units.number
 
                 if (units or cost) and node.account:
                     balances[node.account] = {"units": units, "cost": cost}
-            for child in node.values():
-                traverse(child)
 
+        # Pre-order walk with an explicit stack (parents first, siblings in tree order);
+        # no Python frame per account and no recursion limit on deep hierarchies
         if account_roots:
-            for root in account_roots:
-                if root in real_root:
-                    traverse(real_root[root])
+            stack = [real_root[root] for root in reversed(account_roots) if root in real_root]
         else:
-            traverse(real_root)
+            stack = [real_root]
+        while stack:
+            node = stack.pop()
+            visit(node)
+            stack.extend(reversed(node.values()))
 
         return balances
 
@@ -575,20 +975,31 @@ class ReportService:
         # 1. Get raw base balances (units and cost)
         base_balances = self.get_balances(account_roots=["Assets"], convert_to=None)
 
-        # 2. Get converted balances for each target (Market and Cost)
-        market_data = {}
-        cost_data = {}
+        # 2. Get converted balances for each target (Market and Cost), keeping only the
+        # converted amount per account so the leaf loop does a single lookup
+        market_data: dict[str, dict[str, Decimal]] = {}
+        cost_data: dict[str, dict[str, Decimal]] = {}
         for target in target_currencies or []:
-            market_data[target] = self.get_balances(
-                account_roots=["Assets"], convert_to=target, valuation="market"
+            market_data[target] = _amounts_in(
+                self.get_balances(account_roots=["Assets"], convert_to=target, valuation="market"),
+                target,
             )
-            cost_data[target] = self.get_balances(
-                account_roots=["Assets"], convert_to=target, valuation="cost"
+            cost_data[target] = _amounts_in(
+                self.get_balances(account_roots=["Assets"], convert_to=target, valuation="cost"),
+                target,
             )
+        zero = Decimal(0)
 
         # 3. Identify leaf accounts and aggregate
-        for acc in sorted(base_balances.keys()):
-            has_child = any(other.startswith(acc + ":") for other in base_balances.keys())
+        accounts = sorted(base_balances)
+        n_accounts = len(accounts)
+        for acc in accounts:
+            # Descendants of `acc` sort contiguously from `acc + ":"`, so one binary search
+            # finds the first candidate. (The next sorted name is not enough on its own:
+            # "Assets:Bank-X" sorts between "Assets:Bank" and "Assets:Bank:Checking".)
+            prefix = acc + ":"
+            i = bisect_left(accounts, prefix)
+            has_child = i < n_accounts and accounts[i].startswith(prefix)
             if not has_child:
                 # This is a leaf account
                 acc_holdings = {
@@ -600,12 +1011,10 @@ class ReportService:
 
                 for target in target_currencies or []:
                     # Market Value
-                    m_bal = market_data[target].get(acc, {"units": {}})
-                    m_val = m_bal["units"].get(target, Decimal(0))
+                    m_val = market_data[target].get(acc, zero)
 
                     # Cost Basis
-                    c_bal = cost_data[target].get(acc, {"units": {}})
-                    c_val = c_bal["units"].get(target, Decimal(0))
+                    c_val = cost_data[target].get(acc, zero)
 
                     gain = m_val - c_val
 
@@ -627,25 +1036,32 @@ class ReportService:
         return results
 
 
+def _amounts_in(
+    balances: dict[str, dict[str, dict[str, Decimal]]], currency: str
+) -> dict[str, Decimal]:
+    """Map each account to its `currency` units, skipping accounts without any."""
+    return {
+        acc: units[currency] for acc, bal in balances.items() if currency in (units := bal["units"])
+    }
+
+
 class AccountService:
-    def __init__(self, ledger_file: Path):
+    def __init__(self, ledger_file: Path, ledger_service: LedgerService | None = None):
         self.ledger_file = ledger_file
-        self.ledger_service = LedgerService(ledger_file)
+        self.ledger_service = ledger_service or LedgerService(ledger_file)
 
     def list_accounts(self) -> list[AccountModel]:
-        self.ledger_service.load()
         # Find Open directives
         accounts = []
-        for e in self.ledger_service.entries:
-            if isinstance(e, data.Open):
-                accounts.append(
-                    AccountModel(
-                        name=e.account,
-                        open_date=e.date,
-                        currencies=e.currencies if e.currencies else [],
-                        meta=e.meta,
-                    )
+        for e in self.ledger_service.entries_of(data.Open):
+            accounts.append(
+                AccountModel(
+                    name=e.account,
+                    open_date=e.date,
+                    currencies=e.currencies if e.currencies else [],
+                    meta=e.meta,
                 )
+            )
         return sorted(accounts, key=lambda a: a.name)
 
     def create_account(self, account: AccountModel, target_file: Path | None = None) -> None:
@@ -653,7 +1069,7 @@ class AccountService:
         Create a new account by appending an Open directive.
         """
         self.ledger_service.load()
-        existing = set(self.ledger_service.get_accounts())
+        existing = self.ledger_service.get_account_set()
         if account.name in existing:
             raise ValueError(f"Account '{account.name}' already exists.")
 
@@ -677,8 +1093,7 @@ class AccountService:
             if target_path.exists() or target_path.parent.exists():
                 actual_target = target_path
 
-        with open(actual_target, "a") as f:
-            f.write("\n" + entry_str)
+        _append_entry(actual_target, entry_str)
         print(f"Account created in {actual_target}")
 
     def add_balance(self, balance: BalanceModel, target_file: Path | None = None) -> None:
@@ -686,7 +1101,7 @@ class AccountService:
         Add a Balance directive to the ledger.
         """
         self.ledger_service.load()
-        existing = set(self.ledger_service.get_accounts())
+        existing = self.ledger_service.get_account_set()
         if str(balance.account) not in existing:
             raise ValueError(f"Account '{balance.account}' does not exist (no Open directive).")
 
@@ -695,31 +1110,28 @@ class AccountService:
 
         actual_target = target_file or self.ledger_file
 
-        with open(actual_target, "a") as f:
-            f.write("\n" + entry_str)
+        _append_entry(actual_target, entry_str)
         print(f"Balance check added to {actual_target}")
 
 
 class CommodityService:
-    def __init__(self, ledger_file: Path):
+    def __init__(self, ledger_file: Path, ledger_service: LedgerService | None = None):
         self.ledger_file = ledger_file
-        self.ledger_service = LedgerService(ledger_file)
+        self.ledger_service = ledger_service or LedgerService(ledger_file)
 
     def list_commodities(self, asset_class: str | None = None) -> list[CommodityModel]:
-        self.ledger_service.load()
         models = []
-        for e in self.ledger_service.entries:
-            if isinstance(e, data.Commodity):
-                meta = e.meta if e.meta else {}
-                if asset_class and meta.get("asset-class") != asset_class:
-                    continue
-                models.append(
-                    CommodityModel(
-                        currency=e.currency,
-                        date=e.date,
-                        meta=meta,
-                    )
+        for e in self.ledger_service.entries_of(data.Commodity):
+            meta = e.meta if e.meta else {}
+            if asset_class and meta.get("asset-class") != asset_class:
+                continue
+            models.append(
+                CommodityModel(
+                    currency=e.currency,
+                    date=e.date,
+                    meta=meta,
                 )
+            )
         return sorted(models, key=lambda m: m.currency)
 
     def get_undeclared_commodities(self) -> list[UndeclaredCommodityModel]:
@@ -727,7 +1139,7 @@ class CommodityService:
         Return a list of currencies used in transactions but missing a `commodity` directive.
         """
         used = self.ledger_service.get_used_currencies()
-        declared = set(self.ledger_service.get_commodities())
+        declared = self.ledger_service.get_commodity_set()
         undeclared = sorted(used - declared)
         return [UndeclaredCommodityModel(currency=c) for c in undeclared]
 
@@ -741,7 +1153,7 @@ class CommodityService:
         Create a Commodity directive.
         """
         self.ledger_service.load()
-        existing = set(self.ledger_service.get_commodities())
+        existing = self.ledger_service.get_commodity_set()
         if str(currency) in existing:
             raise ValueError(f"Commodity '{currency}' already exists.")
 
@@ -762,8 +1174,7 @@ class CommodityService:
             if target_path.exists() or target_path.parent.exists():
                 target_file = target_path
 
-        with open(target_file, "a") as f:
-            f.write("\n" + entry_str)
+        _append_entry(target_file, entry_str)
         print(f"Commodity created in {target_file}")
 
 
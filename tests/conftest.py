@@ -1,45 +1,118 @@
-import tempfile
+import io
+import shutil
+import subprocess
 import textwrap
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", help="also run tests marked slow")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: long-running test, skipped unless --run-slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+_SAMPLE_LEDGER = textwrap.dedent("""
+    option "title" "Test Ledger"
+    option "operating_currency" "USD"
+
+    2020-01-01 open Assets:Cash USD
+    2020-01-01 open Expenses:Food USD
+    2020-01-01 open Income:Salary USD
+
+    2023-01-01 * "Employer" "Salary"
+      Income:Salary      -1000.00 USD
+      Assets:Cash         1000.00 USD
+""")
+
+
+@pytest.fixture(scope="session")
+def shared_beancount_file(tmp_path_factory):
+    """
+    Returns a path to the sample ledger, written once per session.
+    Only for tests that never modify the file; its parse is reused across them.
+    Under pytest-xdist, tmp_path_factory is per worker, so each worker parses its own copy.
+    """
+    path = tmp_path_factory.mktemp("shared") / "shared.beancount"
+    path.write_text(_SAMPLE_LEDGER)
+    return path
+
+
 @pytest.fixture
-def temp_beancount_file():
-    """Returns a path to a temporary beancount file with some basic content."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".beancount", delete=False) as f:
-        f.write(
-            textwrap.dedent("""
-            option "title" "Test Ledger"
-            option "operating_currency" "USD"
-            
-            2020-01-01 open Assets:Cash USD
-            2020-01-01 open Expenses:Food USD
-            2020-01-01 open Income:Salary USD
-            
-            2023-01-01 * "Employer" "Salary"
-              Income:Salary      -1000.00 USD
-              Assets:Cash         1000.00 USD
-        """)
-        )
-        path = Path(f.name)
-
-    yield path
-
-    # Cleanup
-    if path.exists():
-        path.unlink()
+def temp_beancount_file(shared_beancount_file, tmp_path):
+    """Returns a path to a private copy of the sample ledger that a test may modify."""
+    path = tmp_path / "ledger.beancount"
+    shutil.copyfile(shared_beancount_file, path)
+    return path
 
 
 @pytest.fixture
-def clean_ledger_file():
+def clean_ledger_file(tmp_path):
     """Returns a path to an empty temporary beancount file."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".beancount", delete=False) as f:
-        f.write('option "title" "Empty Ledger"\n')
-        path = Path(f.name)
+    path = tmp_path / "empty.beancount"
+    path.write_text('option "title" "Empty Ledger"\n')
+    return path
+
+
+_FORMATTED_CONTENT = "; formatted content\n"
 
-    yield path
 
-    if path.exists():
-        path.unlink()
+class _MockResult:
+    returncode = 0
+    stdout = ""
+    stderr = ""
+
+
+def _fake_bean_format(cmd):
+    out_idx = cmd.index("-o") + 1
+    Path(cmd[out_idx]).write_text(_FORMATTED_CONTENT)
+    return _MockResult()
+
+
+_FAKE_COMMANDS = {"bean-format": _fake_bean_format}
+
+
+@pytest.fixture(autouse=True)
+def _no_external_bean(monkeypatch):
+    """Stubs subprocess.run for the bean-* tools so no test spawns them; other commands run."""
+    real_run = subprocess.run
+
+    def fake_run(cmd, *args, **kwargs):
+        fake = _FAKE_COMMANDS.get(cmd[0])
+        if fake is None:
+            return real_run(cmd, *args, **kwargs)
+        return fake(cmd)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+
+def _run_cli(*args):
+    from beancount_cli.cli import main
+
+    with patch("sys.stdout", new=io.StringIO()) as stdout:
+        with patch("sys.stderr", new=io.StringIO()) as stderr:
+            try:
+                main(list(args))
+                return 0, stdout.getvalue(), stderr.getvalue()
+            except SystemExit as e:
+                code = e.code if e.code is not None else 0
+                return code, stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.fixture
+def run_cli():
+    """Returns a callable running the CLI in-process: run_cli(*argv) -> (code, stdout, stderr)."""
+    return _run_cli
@@ -1,5 +1,10 @@
+import glob
+import os
+
+import pytest
+
 from beancount_cli.models import AccountModel
-from beancount_cli.services import AccountService, LedgerService, MapService
+from beancount_cli.services import AccountService, LedgerService, MapService, _glob_includes
 
 
 def test_complex_include_structure(tmp_path):
@@ -74,14 +79,11 @@ def test_subfile_config_resolution(tmp_path):
     assert "Assets:Test" in target.read_text()
 
 
-def test_deep_nesting_performance(tmp_path):
-    """
-    Test deep nesting level.
-    """
+def _check_deep_nesting(tmp_path, depth):
     curr = tmp_path / "0.beancount"
     curr.write_text("2024-01-01 open Assets:Root USD")
 
-    for i in range(1, 10):
+    for i in range(1, depth):
         next_file = tmp_path / f"{i}.beancount"
         next_file.write_text(f'include "{i - 1}.beancount"')
         curr = next_file
@@ -103,3 +105,92 @@ def test_deep_nesting_performance(tmp_path):
         return False
 
     assert find_level_0(tree)
+
+
+def test_deep_nesting_performance(tmp_path):
+    """
+    Test nested includes; three levels cover the recursive path.
+    """
+    _check_deep_nesting(tmp_path, 3)
+
+
+@pytest.mark.slow
+def test_deep_nesting_performance_ten_levels(tmp_path):
+    _check_deep_nesting(tmp_path, 10)
+
+
+def test_include_tree_stops_at_cycles(tmp_path):
+    a = tmp_path / "a.beancount"
+    b = tmp_path / "b.beancount"
+    a.write_text('include "b.beancount"\ninclude "missing/*.beancount"\n')
+    b.write_text('include "a.beancount"\n')
+
+    tree = MapService(a).get_include_tree()
+    assert tree == {
+        str(b): {str(a): {}},
+        "missing/*.beancount (No matches)": {},
+    }
+
+
+def test_include_tree_globs_match_files_only(tmp_path):
+    (tmp_path / "y2024").mkdir()
+    (tmp_path / "y2024" / "jan.beancount").write_text("")
+    (tmp_path / "y2024" / "notes.txt").write_text("")
+    (tmp_path / "y2024" / "old.beancount").mkdir()
+    root = tmp_path / "main.beancount"
+    root.write_text('include "y2024/*.beancount"\ninclude "y*/jan.beancount"\n')
+
+    jan = str(tmp_path / "y2024" / "jan.beancount")
+    assert MapService(root).get_include_tree() == {jan: {}}
+
+
+def test_include_globs_agree_with_glob_module(tmp_path):
+    base = tmp_path / "books[2024]"
+    for rel in (
+        "y2024/jan.beancount",
+        "y2024/.jan.beancount",
+        "y2025/feb.beancount",
+        ".hidden/mar.beancount",
+        "y2024/sub/apr.beancount",
+    ):
+        (base / rel).parent.mkdir(parents=True, exist_ok=True)
+        (base / rel).write_text("")
+    (base / "y2024" / "dir.beancount").mkdir()
+
+    for pattern in (
+        "y*/*.beancount",
+        "y2024/.*.beancount",
+        "*/mar.beancount",
+        ".*/*.beancount",
+        "y202[45]/sub/*.beancount",
+        "**/*.beancount",
+    ):
+        expected = sorted(
+            p
+            for p in glob.glob(os.path.join(glob.escape(str(base)), pattern), recursive=True)
+            if os.path.isfile(p)
+        )
+        assert sorted(map(str, _glob_includes(base, pattern))) == expected, pattern
+
+
+def test_include_tree_reuses_glob_until_directory_changes(tmp_path, monkeypatch):
+    trades = tmp_path / "trades"
+    trades.mkdir()
+    (trades / "a.beancount").write_text("")
+    root = tmp_path / "main.beancount"
+    root.write_text('include "trades/*.beancount"\n')
+    service = MapService(root)
+    first = service.get_include_tree()
+
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda p: scans.append(p) or real_scandir(p))
+    assert service.get_include_tree() == first
+    assert scans == []
+
+    (trades / "b.beancount").write_text("")
+    os.utime(trades, ns=(0, 10**18))
+    assert list(service.get_include_tree()) == [
+        str(trades / n) for n in ("a.beancount", "b.beancount")
+    ]
+    assert scans == [trades]
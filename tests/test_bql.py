@@ -1,13 +1,13 @@
 import pytest
 
-from beancount_cli.services import TransactionService
+from beancount_cli.services import TransactionService, _parse_bql_ids
 
 
-def test_bql_filtering_basics(temp_beancount_file):
-    service = TransactionService(temp_beancount_file)
+def test_bql_filtering_basics(shared_beancount_file):
+    service = TransactionService(shared_beancount_file)
 
     # 1. Filter by amount
-    # temp_beancount_file has a Salary transaction of 1000 USD
+    # shared_beancount_file has a Salary transaction of 1000 USD
     txs = service.list_transactions(bql_where="number > 500")
     assert len(txs) == 1
     assert txs[0].narration == "Salary"
@@ -22,11 +22,11 @@ def test_bql_filtering_basics(temp_beancount_file):
     assert txs[0].payee == "Employer"
 
 
-def test_bql_combined_filtering(temp_beancount_file):
+def test_bql_combined_filtering(shared_beancount_file):
     """
     Test combining Python regex filters with BQL.
     """
-    service = TransactionService(temp_beancount_file)
+    service = TransactionService(shared_beancount_file)
 
     # Regex for account + BQL for amount
     txs = service.list_transactions(account_regex="Assets:Cash", bql_where="number > 100")
@@ -39,8 +39,16 @@ def test_bql_combined_filtering(temp_beancount_file):
     assert len(txs) == 0
 
 
-def test_bql_syntax_error(temp_beancount_file):
-    service = TransactionService(temp_beancount_file)
+def test_bql_syntax_error(shared_beancount_file):
+    service = TransactionService(shared_beancount_file)
     # Invalid BQL syntax
     with pytest.raises(ValueError, match="BQL query failed: syntax error"):
         service.list_transactions(bql_where="invalid logic here")
+
+
+def test_bql_parse_is_reused_across_calls(shared_beancount_file, temp_beancount_file):
+    _parse_bql_ids.cache_clear()
+    for ledger in (shared_beancount_file, temp_beancount_file):
+        txs = TransactionService(ledger).list_transactions(bql_where="number > 500")
+        assert len(txs) == 1
+    assert _parse_bql_ids.cache_info().hits == 1
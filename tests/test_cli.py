@@ -1,34 +1,24 @@
-import io
 import json
-from unittest.mock import patch
+from pathlib import Path
+from types import SimpleNamespace
 
-from beancount_cli.cli import main
+from beancount_cli.commands.root import format_ledger
+from beancount_cli.services import LedgerService
 
 
-def run_cli(*args):
-    with patch("sys.stdout", new=io.StringIO()) as stdout:
-        with patch("sys.stderr", new=io.StringIO()) as stderr:
-            try:
-                main(list(args))
-                return 0, stdout.getvalue(), stderr.getvalue()
-            except SystemExit as e:
-                code = e.code if e.code is not None else 0
-                return code, stdout.getvalue(), stderr.getvalue()
-
-
-def test_check_command(temp_beancount_file):
-    code, out, err = run_cli("check", str(temp_beancount_file))
+def test_check_command(run_cli, shared_beancount_file):
+    code, out, err = run_cli("check", str(shared_beancount_file))
     assert code in (0, None)
     assert "No errors found" in out
 
 
-def test_transaction_list(temp_beancount_file):
-    code, out, err = run_cli("transaction", "list", str(temp_beancount_file))
+def test_transaction_list(run_cli, shared_beancount_file):
+    code, out, err = run_cli("transaction", "list", str(shared_beancount_file))
     assert code in (0, None)
     assert "Employer" in out
 
 
-def test_transaction_add_json(temp_beancount_file):
+def test_transaction_add_json(run_cli, temp_beancount_file):
     payload = {
         "date": "2023-12-01",
         "narration": "CLI Test",
@@ -42,11 +32,33 @@ def test_transaction_add_json(temp_beancount_file):
     )
     assert code in (0, None)
 
-    check_code, check_out, check_err = run_cli("check", str(temp_beancount_file))
-    assert check_code in (0, None)
+    ledger = LedgerService(temp_beancount_file)
+    ledger.load()
+    assert ledger.errors == []
 
 
-def test_account_create(temp_beancount_file):
+def test_transaction_add_json_batch(run_cli, temp_beancount_file):
+    payload = [
+        {
+            "date": f"2023-12-0{day}",
+            "narration": f"Batch {day}",
+            "postings": [
+                {"account": "Assets:Cash", "units": {"number": -5, "currency": "USD"}},
+                {"account": "Expenses:Food", "units": {"number": 5, "currency": "USD"}},
+            ],
+        }
+        for day in (1, 2)
+    ]
+    code, out, err = run_cli(
+        "transaction", "add", str(temp_beancount_file), "--json", json.dumps(payload)
+    )
+    assert code in (0, None)
+    content = temp_beancount_file.read_text()
+    assert "Batch 1" in content
+    assert "Batch 2" in content
+
+
+def test_account_create(run_cli, temp_beancount_file):
     code, out, err = run_cli(
         "account",
         "create",
@@ -60,7 +72,7 @@ def test_account_create(temp_beancount_file):
     assert "created" in out
 
 
-def test_commodity_create(temp_beancount_file):
+def test_commodity_create(run_cli, temp_beancount_file):
     code, out, err = run_cli(
         "commodity", "create", "ETH", str(temp_beancount_file), "--name", "Ethereum"
     )
@@ -68,78 +80,87 @@ def test_commodity_create(temp_beancount_file):
     assert "created" in out
 
 
-def test_tree_command(temp_beancount_file):
-    code, out, err = run_cli("tree", str(temp_beancount_file))
+def test_tree_command(run_cli, shared_beancount_file):
+    code, out, err = run_cli("tree", str(shared_beancount_file))
     assert code in (0, None)
-    assert str(temp_beancount_file) in out
+    assert str(shared_beancount_file) in out
+
 
+def test_tree_command_does_not_parse_ledger(run_cli, shared_beancount_file, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("tree must not load the ledger")
 
-def test_report_aliases(temp_beancount_file):
-    code, out, err = run_cli("report", "balance-sheet", str(temp_beancount_file))
+    monkeypatch.setattr("beancount_cli.services.loader.load_file", fail)
+    code, out, err = run_cli("tree", str(shared_beancount_file))
     assert code in (0, None)
-    assert "Balance Sheet" in out
+    assert str(shared_beancount_file) in out
+
 
-    code, out, err = run_cli("report", "trial-balance", str(temp_beancount_file))
+def test_report_aliases(run_cli, shared_beancount_file):
+    code, out, err = run_cli("report", "balance-sheet", str(shared_beancount_file))
     assert code in (0, None)
-    assert "Trial Balance" in out
+    assert "Balance Sheet" in out
 
-    code, out, err = run_cli("tree", str(temp_beancount_file))
+    code, out, err = run_cli("report", "trial-balance", str(shared_beancount_file))
     assert code in (0, None)
-    assert str(temp_beancount_file) in out
+    assert "Trial Balance" in out
 
 
-def test_report_holdings(temp_beancount_file):
-    code, out, err = run_cli("report", "holdings", str(temp_beancount_file))
+def test_report_holdings(run_cli, shared_beancount_file):
+    code, out, err = run_cli("report", "holdings", str(shared_beancount_file))
     assert code in (0, None)
     assert "Holdings" in out
 
 
-def test_report_audit(temp_beancount_file):
-    code, out, err = run_cli("report", "audit", str(temp_beancount_file), "--currency", "USD")
+def test_report_audit(run_cli, shared_beancount_file):
+    code, out, err = run_cli("report", "audit", str(shared_beancount_file), "--currency", "USD")
     assert code in (0, None)
     assert "Audit Report: USD" in out
 
 
-def test_tx_schema():
+def test_tx_schema(run_cli):
     code, out, err = run_cli("transaction", "add", "--schema")
     assert code in (0, None)
     assert "properties" in out
 
 
-def test_account_list(temp_beancount_file):
-    code, out, err = run_cli("account", "list", str(temp_beancount_file))
+def test_account_list(run_cli, shared_beancount_file):
+    code, out, err = run_cli("account", "list", str(shared_beancount_file))
     assert code in (0, None)
     assert "Assets:Cash" in out
 
 
-def test_format_cmd(temp_beancount_file, monkeypatch):
-    import subprocess
-
-    def mock_run(*args, **kwargs):
-        class MockResult:
-            stdout = ""
-
-        cmd_list = args[0]
-        if "-o" in cmd_list:
-            out_idx = cmd_list.index("-o") + 1
-            with open(cmd_list[out_idx], "w") as f:
-                f.write("; formatted content\n")
-        return MockResult()
-
-    monkeypatch.setattr(subprocess, "run", mock_run)
+def test_format_cmd(run_cli, temp_beancount_file):
     code, out, err = run_cli("format", str(temp_beancount_file))
     assert code in (0, None)
     assert "Formatted" in out
+    assert temp_beancount_file.read_text() == "; formatted content\n"
+
+
+def test_format_ledger_uses_injected_runner(tmp_path):
+    ledger = tmp_path / "ledger.beancount"
+    ledger.write_text("; original\n")
+    calls = []
+
+    def runner(cmd, **kwargs):
+        calls.append(cmd[0])
+        Path(cmd[cmd.index("-o") + 1]).write_text("; formatted\n")
+        return SimpleNamespace(stdout="")
+
+    format_ledger(ledger, _runner=runner)
+    assert calls == ["bean-format"]
+    assert ledger.read_text() == "; formatted\n"
+    assert list(tmp_path.iterdir()) == [ledger]
 
 
-def test_price_cmd(temp_beancount_file):
+def test_price_cmd(run_cli, shared_beancount_file):
     # `price` is now a subcommand group; calling it without a subcommand shows help
     code, out, err = run_cli("price", "--help")
     assert code in (0, None)
     assert "check" in out or "fetch" in out
 
 
-def test_missing_ledger_file(monkeypatch):
+def test_missing_ledger_file(run_cli, monkeypatch):
     import os
 
     if "BEANCOUNT_FILE" in os.environ:
@@ -152,14 +173,14 @@ def test_missing_ledger_file(monkeypatch):
     assert "Traceback" not in err
 
 
-def test_report_holdings_help_hides_audit_only_flags():
+def test_report_holdings_help_hides_audit_only_flags(run_cli):
     code, out, err = run_cli("report", "holdings", "--help")
     assert code in (0, None)
     assert "--limit" not in out
     assert "--all" not in out
 
 
-def test_report_audit_help_shows_audit_only_flags():
+def test_report_audit_help_shows_audit_only_flags(run_cli):
     code, out, err = run_cli("report", "audit", "--help")
     assert code in (0, None)
     assert "--limit" in out
@@ -1,4 +1,7 @@
-from beancount_cli.config import CliConfig
+from pathlib import Path
+
+from beancount_cli import config as config_module
+from beancount_cli.config import CliConfig, _read_dotenv
 
 
 def test_beancount_file_env_var_is_respected(monkeypatch, tmp_path):
@@ -27,3 +30,53 @@ def test_beancount_path_env_var_is_respected(monkeypatch, tmp_path):
     config = CliConfig()
     assert config.path == ledger_dir
     assert config.get_resolved_ledger() == main_file
+
+    # The fallback lookup is resolved once per config
+    monkeypatch.setattr(config_module, "_first_existing", lambda *p: None)
+    assert config.get_resolved_ledger() == main_file
+
+
+def test_dotenv_file_is_used_when_env_var_missing(monkeypatch, tmp_path):
+    ledger = tmp_path / "ledger.beancount"
+    ledger.write_text('option "title" "Test"\n', encoding="utf-8")
+    (tmp_path / ".env").write_text(f'# comment\nBEANCOUNT_FILE="{ledger}"\n', encoding="utf-8")
+
+    monkeypatch.delenv("BEANCOUNT_FILE", raising=False)
+    monkeypatch.delenv("BEANCOUNT_PATH", raising=False)
+    monkeypatch.chdir(tmp_path)
+    _read_dotenv.cache_clear()
+    try:
+        config = CliConfig()
+    finally:
+        _read_dotenv.cache_clear()
+
+    assert config.file == ledger
+    assert config.path is None
+
+
+def test_dotenv_strips_inline_comments(tmp_path):
+    env = tmp_path / ".env"
+    env.write_text(
+        "BEANCOUNT_FILE=main.beancount  # the ledger\n"
+        'BEANCOUNT_PATH="books # 2024" # quoted\n'
+        "OTHER=a#b\n",
+        encoding="utf-8",
+    )
+    assert _read_dotenv(str(env)) == {
+        "BEANCOUNT_FILE": "main.beancount",
+        "BEANCOUNT_PATH": "books # 2024",
+        "OTHER": "a#b",
+    }
+
+
+def test_dotenv_follows_working_directory(monkeypatch, tmp_path):
+    monkeypatch.delenv("BEANCOUNT_FILE", raising=False)
+    monkeypatch.delenv("BEANCOUNT_PATH", raising=False)
+    for name in ("one", "two"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / ".env").write_text(f"BEANCOUNT_FILE={name}.beancount\n")
+
+    monkeypatch.chdir(tmp_path / "one")
+    assert CliConfig().file == Path("one.beancount")
+    monkeypatch.chdir(tmp_path / "two")
+    assert CliConfig().file == Path("two.beancount")
@@ -1,25 +1,9 @@
 import json as jsonlib
 
-from beancount_cli.cli import main
 
-
-def _run_cli(*args):
-    import io
-    from unittest.mock import patch
-
-    with patch("sys.stdout", new=io.StringIO()) as stdout:
-        with patch("sys.stderr", new=io.StringIO()) as stderr:
-            try:
-                main(list(args))
-                return 0, stdout.getvalue(), stderr.getvalue()
-            except SystemExit as e:
-                code = e.code if e.code is not None else 0
-                return code, stdout.getvalue(), stderr.getvalue()
-
-
-def test_report_holdings_json(temp_beancount_file):
+def test_report_holdings_json(run_cli, shared_beancount_file):
     """Exercises the holdings JSON output path (render_output(holdings, format='json'))."""
-    code, out, _ = _run_cli("report", "holdings", str(temp_beancount_file), "--format", "json")
+    code, out, _ = run_cli("report", "holdings", str(shared_beancount_file), "--format", "json")
     data = jsonlib.loads(out)
     if isinstance(data, list):
         if data:
@@ -28,39 +12,39 @@ def test_report_holdings_json(temp_beancount_file):
         assert "Account" in data
 
 
-def test_tx_list_json_format(temp_beancount_file):
+def test_tx_list_json_format(run_cli, shared_beancount_file):
     """Exercises the JSON format path in tx_list_cmd."""
-    code, out, _ = _run_cli("transaction", "list", str(temp_beancount_file), "--format", "json")
+    code, out, _ = run_cli("transaction", "list", str(shared_beancount_file), "--format", "json")
     data = jsonlib.loads(out)
     assert isinstance(data, (list, dict))
 
 
-def test_account_create_json_batch(temp_beancount_file):
+def test_account_create_json_batch(run_cli, temp_beancount_file):
     """Exercises the JSON batch path in account_create_cmd."""
     payload = jsonlib.dumps(
         [{"name": "Assets:Savings2", "open_date": "2024-01-01", "currencies": ["USD"]}]
     )
-    code, out, err = _run_cli("account", "create", str(temp_beancount_file), "--json", payload)
+    code, out, err = run_cli("account", "create", str(temp_beancount_file), "--json", payload)
     assert code in (0, None)
 
 
-def test_check_cmd_with_errors(temp_beancount_file):
+def test_check_cmd_with_errors(run_cli, temp_beancount_file):
     # write corrupt data
     with open(temp_beancount_file, "a") as f:
         f.write("\n2022-01-01 INVALID_STATEMENT\n")
-    code, out, err = _run_cli("check", str(temp_beancount_file))
+    code, out, err = run_cli("check", str(temp_beancount_file))
     assert code == 1  # EXIT_VALIDATION, not system error
     assert "Traceback" not in err
 
 
-def test_check_missing_file_exits_system(tmp_path):
-    code, out, err = _run_cli("check", str(tmp_path / "nope.beancount"))
+def test_check_missing_file_exits_system(run_cli, tmp_path):
+    code, out, err = run_cli("check", str(tmp_path / "nope.beancount"))
     assert code == 2  # EXIT_SYSTEM
     assert "Traceback" not in err
 
 
-def test_check_missing_file_json(tmp_path):
-    code, out, err = _run_cli("check", "--format", "json", str(tmp_path / "nope.beancount"))
+def test_check_missing_file_json(run_cli, tmp_path):
+    code, out, err = run_cli("check", "--format", "json", str(tmp_path / "nope.beancount"))
     assert code == 2
     payload = jsonlib.loads(err)
     assert payload["exit_code"] == 2
@@ -68,10 +52,10 @@ def test_check_missing_file_json(tmp_path):
     assert "Traceback" not in err
 
 
-def test_check_validation_errors_json(temp_beancount_file):
+def test_check_validation_errors_json(run_cli, temp_beancount_file):
     with open(temp_beancount_file, "a") as f:
         f.write("\n2022-01-01 INVALID_STATEMENT\n")
-    code, out, err = _run_cli("check", "--format", "json", str(temp_beancount_file))
+    code, out, err = run_cli("check", "--format", "json", str(temp_beancount_file))
     assert code == 1
     payload = jsonlib.loads(err)
     assert payload["error"] is True
@@ -81,26 +65,26 @@ def test_check_validation_errors_json(temp_beancount_file):
     assert len(payload["errors"]) > 0
 
 
-def test_report_audit_json(temp_beancount_file):
-    code, out, err = _run_cli(
-        "report", "audit", str(temp_beancount_file), "--currency", "USD", "--format", "json"
+def test_report_audit_json(run_cli, shared_beancount_file):
+    code, out, err = run_cli(
+        "report", "audit", str(shared_beancount_file), "--currency", "USD", "--format", "json"
     )
     assert code == 0
     data = jsonlib.loads(out)
     assert isinstance(data, list)
 
 
-def test_report_balance_sheet_csv(temp_beancount_file):
-    code, out, err = _run_cli(
-        "report", "balance-sheet", str(temp_beancount_file), "--format", "csv"
+def test_report_balance_sheet_csv(run_cli, shared_beancount_file):
+    code, out, err = run_cli(
+        "report", "balance-sheet", str(shared_beancount_file), "--format", "csv"
     )
     assert code == 0
     assert "Account" in out or "Account" in err
 
 
-def test_report_trial_balance_csv(temp_beancount_file):
-    code, out, err = _run_cli(
-        "report", "trial-balance", str(temp_beancount_file), "--format", "csv"
+def test_report_trial_balance_csv(run_cli, shared_beancount_file):
+    code, out, err = run_cli(
+        "report", "trial-balance", str(shared_beancount_file), "--format", "csv"
     )
     assert code == 0
     assert "Account" in out or "Account" in err
@@ -0,0 +1,120 @@
+import datetime
+import io
+import json
+from decimal import Decimal
+
+from beancount_cli.formatting import Console, Table, Tree, apply_tags, render_output, strip_tags
+
+
+def _sample_table() -> Table:
+    table = Table(title="[bold]T[/bold]")
+    table.add_column("Account", style="cyan")
+    table.add_column("Amount", justify="right")
+    table.add_row("Assets:Cash", "[green]1,000.00[/green]")
+    table.add_section()
+    table.add_row("[bold]TOTAL[/bold]", "5")
+    return table
+
+
+def test_strip_tags():
+    assert strip_tags("[bold]Total[/bold]") == "Total"
+    assert strip_tags("[bold blue]x[/bold blue] y") == "x y"
+    assert strip_tags("plain") == "plain"
+    assert strip_tags(42) == "42"
+
+
+def test_apply_tags():
+    assert apply_tags("[red]err[/red]") == "\033[91merr\033[0m"
+    assert apply_tags("[bold blue]x[/bold blue]") == "\033[1m\033[94mx\033[0m"
+    assert apply_tags("plain") == "plain"
+    assert apply_tags("[x] [not a tag]") == "[x] [not a tag]"
+    assert apply_tags("[x [red]err[/red]") == "[x \033[91merr\033[0m"
+
+
+def test_table_render():
+    assert str(_sample_table()) == (
+        "[bold]T[/bold]\n"
+        "[cyan]Account[/cyan]     |   Amount\n"
+        "------------+---------\n"
+        "Assets:Cash | [green]1,000.00[/green]\n"
+        "------------+---------\n"
+        "[bold]TOTAL[/bold]       |        5"
+    )
+
+
+def test_add_rows_columnar_matches_add_row():
+    by_row = Table()
+    by_col = Table()
+    for t in (by_row, by_col):
+        t.add_column("A")
+        t.add_column("B", justify="right")
+    by_row.add_row("x", "1")
+    by_row.add_row("yy", "22")
+    by_col.add_rows_columnar([["x", "yy"], ["1", "22"]])
+    assert str(by_col) == str(by_row)
+
+
+def test_table_render_is_cached_until_modified():
+    table = _sample_table()
+    first = str(table)
+    assert str(table) is first
+
+    table.add_row("Assets:Bank", "7")
+    assert str(table).endswith("Assets:Bank |        7")
+
+
+def test_console_print_streams_table():
+    table = _sample_table()
+    buf = io.StringIO()
+    Console(buf).print(table)
+    assert buf.getvalue() == apply_tags(str(table)) + "\n"
+
+
+def test_tree_render():
+    root = Tree("root")
+    a = root.add("a")
+    a.add("a1")
+    a.add("a2")
+    root.add("b").add("b1")
+    assert str(root) == "root\n├── a\n│   ├── a1\n│   └── a2\n└── b\n    └── b1"
+
+
+def test_render_output_table_truncates_long_cells():
+    buf = io.StringIO()
+    render_output(
+        [{"Account": "Assets:Cash", "Narration": "x" * 50, "Date": "2024-01-01"}],
+        "table",
+        "Tx",
+        Console(buf),
+    )
+    lines = buf.getvalue().splitlines()
+    assert lines[0] == "\033[1mTx\033[0m"
+    assert lines[3] == "Assets:Cash | " + "x" * 39 + "… | 2024-01-01"
+
+
+def test_render_output_truncation_does_not_split_markup():
+    buf = io.StringIO()
+    render_output(
+        [{"Account": "Assets:Cash", "Narration": "[green]" + "y" * 50 + "[/green]"}],
+        "table",
+        console=Console(buf),
+    )
+    row = buf.getvalue().splitlines()[2]
+    assert row == "Assets:Cash | " + "y" * 39 + "…"
+
+
+def test_render_output_csv():
+    buf = io.StringIO()
+    render_output([{"a": 1, "b": None}], "csv", console=Console(buf))
+    assert buf.getvalue().splitlines() == ["a,b", "1,"]
+
+
+def test_render_output_json_matches_stdlib_encoder():
+    data = [
+        {"Amount": Decimal("1.50"), "Date": datetime.date(2024, 1, 1), "Payee": None},
+        {"Payee": "Café Zürich €", "Amount": 0.1},
+    ]
+    buf = io.StringIO()
+    render_output(data, "json", console=Console(buf))
+    assert buf.getvalue() == json.dumps(data, indent=2, default=str) + "\n"
+    assert "Caf\\u00e9" in buf.getvalue()
@@ -5,9 +5,13 @@ import pytest
 from pydantic import ValidationError
 
 from beancount_cli.models import (
+    AccountName,
     AmountModel,
+    CurrencyCode,
     PostingModel,
     TransactionModel,
+    _checked_account_name,
+    _checked_currency_code,
     validate_account_name,
     validate_currency_code,
 )
@@ -33,40 +37,112 @@ def test_transaction_model():
     assert tx.payee is None
 
 
-def test_account_name_validation():
-    # Valid
-    assert validate_account_name("Assets:Cash") == "Assets:Cash"
-    assert validate_account_name("Expenses:Office:Supplies") == "Expenses:Office:Supplies"
-    assert (
-        validate_account_name("Expenses:Office:7622-Equipment-under-3y")
-        == "Expenses:Office:7622-Equipment-under-3y"
-    )
+@pytest.mark.parametrize(
+    ("validate", "value", "error"),
+    [
+        (validate_account_name, "Assets:Cash", None),
+        (validate_account_name, "Expenses:Office:Supplies", None),
+        (validate_account_name, "Expenses:Office:7622-Equipment-under-3y", None),
+        (validate_account_name, "assets:cash", ValueError),
+        (validate_account_name, "Assets::Cash", ValueError),
+        (validate_account_name, "Assets:Cash\n", ValueError),
+        (validate_account_name, 123, TypeError),
+        (validate_currency_code, "USD", None),
+        (validate_currency_code, "AAPL", None),
+        (validate_currency_code, "usd", ValueError),
+        (validate_currency_code, "VERYLONGONECURRENCYNAMEWHICHISOVER24CHARS", ValueError),
+        (validate_currency_code, "USD\n", ValueError),
+        (validate_currency_code, None, TypeError),
+    ],
+)
+def test_value_object_validation(validate, value, error):
+    if error is None:
+        assert validate(value) == value
+        return
+    match = "string required" if error is TypeError else "Invalid .* format"
+    with pytest.raises(error, match=match):
+        validate(value)
 
-    # Invalid
-    with pytest.raises(ValueError, match="Invalid account name format"):
-        validate_account_name("assets:cash")
 
-    with pytest.raises(ValueError, match="Invalid account name format"):
-        validate_account_name("Assets::Cash")
+def test_model_validation_integration():
+    # Should work via Pydantic
+    with pytest.raises(ValidationError):
+        AmountModel(number=Decimal("10"), currency="usd")
 
+    with pytest.raises(ValidationError):
+        PostingModel(account="assets:cash", units=AmountModel(number=Decimal("10"), currency="USD"))
 
-def test_currency_code_validation():
-    # Valid
-    assert validate_currency_code("USD") == "USD"
-    assert validate_currency_code("AAPL") == "AAPL"
 
-    # Invalid
-    with pytest.raises(ValueError, match="Invalid currency code format"):
-        validate_currency_code("usd")
+def test_amount_model_is_immutable():
+    amt = AmountModel(number=Decimal("1"), currency="USD")
+    with pytest.raises(AttributeError):
+        amt.number = Decimal("2")  # type: ignore[misc]
 
-    with pytest.raises(ValueError, match="Invalid currency code format"):
-        validate_currency_code("VERYLONGONECURRENCYNAMEWHICHISOVER24CHARS")
 
+def test_transaction_model_is_frozen():
+    tx = TransactionModel(
+        date=date(2023, 1, 1), narration="Test Tx", tags=["a", "a"], links=["l"], postings=[]
+    )
+    assert tx.tags == frozenset({"a"})
+    assert tx.links == frozenset({"l"})
+    with pytest.raises(ValidationError):
+        tx.flag = "!"  # type: ignore[misc]
 
-def test_model_validation_integration():
-    # Should work via Pydantic
+    posting = PostingModel(account="Assets:Cash", units=AmountModel(Decimal("1"), "USD"))
     with pytest.raises(ValidationError):
-        AmountModel(number=Decimal("10"), currency="usd")
+        posting.flag = "!"  # type: ignore[misc]
+
 
+def test_from_trusted_matches_validated_model():
+    amt = AmountModel(number=Decimal("1"), currency="USD")
+    fields = {"account": AccountName("Assets:Cash"), "units": amt, "flag": None, "meta": {}}
+    assert PostingModel.from_trusted(**fields) == PostingModel(**fields)
+
+    tx_fields = {
+        "date": date(2023, 1, 1),
+        "narration": "Test Tx",
+        "tags": frozenset({"t"}),
+        "postings": [PostingModel(**fields)],
+    }
+    assert TransactionModel.from_trusted(**tx_fields) == TransactionModel(**tx_fields)
+
+
+def test_posting_model_rejects_unknown_fields():
     with pytest.raises(ValidationError):
-        PostingModel(account="assets:cash", units=AmountModel(number=Decimal("10"), currency="USD"))
+        PostingModel(
+            account="Assets:Cash",
+            units=AmountModel(number=Decimal("1"), currency="USD"),
+            acount="typo",
+        )
+
+
+def test_validators_return_value_objects():
+    account = validate_account_name("Assets:Cash")
+    assert type(account) is AccountName
+    assert validate_account_name(account) is account
+    assert type(validate_currency_code("USD")) is CurrencyCode
+
+    post = PostingModel(account="Assets:Cash", units={"number": "1", "currency": "USD"})
+    assert type(post.account) is AccountName
+    assert type(post.units.currency) is CurrencyCode
+
+
+def test_validated_names_share_one_value_object():
+    assert validate_account_name("Assets:" + "Cash") is validate_account_name("Assets:Cash")
+    usd = PostingModel(account="Assets:Cash", units={"number": "1", "currency": "USD"})
+    assert usd.units.currency is validate_currency_code("".join(["U", "S", "D"]))
+
+    # The shared objects live in a bounded cache
+    limit = _checked_account_name.cache_info().maxsize
+    for i in range(limit + 10):
+        validate_account_name(f"Assets:Acc{i}")
+    assert _checked_account_name.cache_info().currsize == limit
+    limit = _checked_currency_code.cache_info().maxsize
+    for i in range(limit + 10):
+        validate_currency_code(f"C{i}X")
+    assert _checked_currency_code.cache_info().currsize == limit
+
+    # Failures are never remembered
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Invalid account name format"):
+            validate_account_name("assets:cash")
@@ -1,6 +1,10 @@
+import re
 from datetime import date
 from decimal import Decimal
 
+import pytest
+from beancount.core import data, realization
+
 from beancount_cli.models import AccountModel, AmountModel, PostingModel, TransactionModel
 from beancount_cli.services import (
     AccountService,
@@ -10,35 +14,247 @@ from beancount_cli.services import (
 )
 
 
-def test_ledger_service_load(temp_beancount_file):
-    service = LedgerService(temp_beancount_file)
+def _make_tx(
+    narration: str, amount: str, tx_date: date = date(2023, 11, 1), flag: str = "*"
+) -> TransactionModel:
+    """
+    Expenses:Food / Assets:Cash transaction for tests that exercise the services,
+    not model validation, so it is built with from_trusted.
+    """
+    return TransactionModel.from_trusted(
+        date=tx_date,
+        flag=flag,
+        narration=narration,
+        postings=[
+            PostingModel.from_trusted(
+                account="Expenses:Food", units=AmountModel(Decimal(amount), "USD")
+            ),
+            PostingModel.from_trusted(
+                account="Assets:Cash", units=AmountModel(-Decimal(amount), "USD")
+            ),
+        ],
+    )
+
+
+def test_ledger_service_load(shared_beancount_file):
+    service = LedgerService(shared_beancount_file)
     service.load()
     assert len(service.entries) > 0
     accounts = service.get_accounts()
     assert "Assets:Cash" in accounts
 
 
+def test_ledger_service_loads_on_first_use(shared_beancount_file, tmp_path):
+    assert len(LedgerService(shared_beancount_file).entries) > 0
+    assert LedgerService(shared_beancount_file).errors == []
+
+    missing = LedgerService(tmp_path / "missing.beancount")
+    with pytest.raises(FileNotFoundError):
+        _ = missing.options
+
+
+def test_ledger_service_reuses_parse_until_include_changes(tmp_path):
+    main = tmp_path / "main.beancount"
+    sub = tmp_path / "sub.beancount"
+    main.write_text('include "sub.beancount"\n')
+    sub.write_text("2020-01-01 open Assets:Cash USD\n")
+
+    first = LedgerService(main)
+    first.load()
+    second = LedgerService(main)
+    second.load()
+    # Same parsed directives, but each instance owns its containers
+    assert second.entries[0] is first.entries[0]
+    assert second.entries is not first.entries
+
+    second.entries.clear()
+    second.options["operating_currency"] = ["EUR"]
+    assert len(LedgerService(main).entries) == 1
+    assert LedgerService(main).options["operating_currency"] == []
+
+    with open(sub, "a") as f:
+        f.write("2020-01-01 open Assets:Bank USD\n")
+    third = LedgerService(main)
+    assert third.get_accounts() == ["Assets:Bank", "Assets:Cash"]
+
+
+def test_model_meta_edits_do_not_reach_cached_parse(tmp_path):
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        "2020-01-01 open Assets:Cash USD\n2020-01-01 open Equity:Opening USD\n"
+        '2020-01-02 * "Open"\n  Assets:Cash 1 USD\n  Equity:Opening -1 USD\n'
+    )
+    tx = TransactionService(main).list_transactions()[0]
+    tx.meta["x"] = 1
+    tx.postings[0].meta["y"] = 2
+
+    (reloaded,) = LedgerService(main).entries_of(data.Transaction)
+    assert "x" not in reloaded.meta
+    assert "y" not in (reloaded.postings[0].meta or {})
+
+
+def test_ledger_cache_skips_result_written_during_parse(tmp_path, monkeypatch):
+    from beancount import loader
+
+    main = tmp_path / "main.beancount"
+    main.write_text("2020-01-01 open Assets:Cash USD\n")
+    real_load_file = loader.load_file
+
+    def load_then_edit(path):
+        result = real_load_file(path)
+        with open(main, "a") as f:
+            f.write("2020-01-01 open Assets:Bank USD\n")
+        return result
+
+    monkeypatch.setattr(loader, "load_file", load_then_edit)
+    assert LedgerService(main).get_accounts() == ["Assets:Cash"]
+    monkeypatch.setattr(loader, "load_file", real_load_file)
+    # The stale parse must not have been cached under the post-write stamps
+    assert LedgerService(main).get_accounts() == ["Assets:Bank", "Assets:Cash"]
+
+
+def test_ledger_cache_keeps_filename_of_symlinked_ledger(tmp_path):
+    main = tmp_path / "main.beancount"
+    main.write_text("2020-01-01 open Assets:Cash USD\n")
+    link = tmp_path / "link.beancount"
+    link.symlink_to(main)
+
+    assert LedgerService(main).entries[0].meta["filename"] == str(main)
+    assert LedgerService(link).entries[0].meta["filename"] == str(link)
+    assert LedgerService(main).entries[0].meta["filename"] == str(main)
+
+
+def test_ledger_options_containers_are_per_instance(tmp_path):
+    main = tmp_path / "main.beancount"
+    main.write_text('option "operating_currency" "USD"\n')
+
+    LedgerService(main).options["operating_currency"].append("EUR")
+    assert LedgerService(main).options["operating_currency"] == ["USD"]
+
+
+def test_ledger_cache_sees_new_file_under_glob_include(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        'include "inbox/*.beancount"\n'
+        "2020-01-01 open Assets:Cash USD\n"
+        "2020-01-01 open Expenses:Food USD\n"
+        '2020-01-01 custom "cli-config" "new_transaction_file" "inbox"\n'
+    )
+    service = TransactionService(main)
+    assert service.list_transactions() == []
+
+    service.add_transaction(_make_tx("Glob Test", "3.00"))
+    assert [tx.narration for tx in TransactionService(main).list_transactions()] == ["Glob Test"]
+
+
+def test_reload_returns_transaction_written_under_glob_include(tmp_path):
+    (tmp_path / "inbox").mkdir()
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        'include "inbox/*.beancount"\n'
+        "2020-01-01 open Assets:Cash USD\n"
+        "2020-01-01 open Expenses:Food USD\n"
+        '2020-01-01 custom "cli-config" "new_transaction_file" "inbox"\n'
+    )
+    service = TransactionService(main)
+    service.add_transaction(_make_tx("Reload Test", "4.00"))
+
+    service.ledger_service.reload()
+    assert [tx.narration for tx in service.list_transactions()] == ["Reload Test"]
+
+
+def test_ledger_cache_sees_created_include_target(tmp_path):
+    main = tmp_path / "main.beancount"
+    main.write_text('include "later.beancount"\n')
+    assert LedgerService(main).get_accounts() == []
+
+    (tmp_path / "later.beancount").write_text("2020-01-01 open Assets:Cash USD\n")
+    assert LedgerService(main).get_accounts() == ["Assets:Cash"]
+
+
+def test_ledger_service_entries_of_and_custom_config(tmp_path):
+    ledger_file = tmp_path / "main.beancount"
+    ledger_file.write_text(
+        '2020-01-01 custom "cli-config" "new_account_file" "a.beancount"\n'
+        "2020-01-01 open Assets:Cash USD\n"
+        '2020-02-01 custom "cli-config" "new_account_file" "b.beancount"\n'
+    )
+    ledger = LedgerService(ledger_file)
+
+    assert [e.account for e in ledger.entries_of(data.Open)] == ["Assets:Cash"]
+    assert ledger.get_custom_config("new_account_file") == "b.beancount"
+    assert ledger.get_custom_config("missing") is None
+
+
+def test_ledger_cache_is_bounded(tmp_path, monkeypatch):
+    from beancount_cli import services
+
+    monkeypatch.setattr(services, "_LEDGER_CACHE", {})
+    monkeypatch.setattr(services, "_LEDGER_CACHE_SIZE", 2)
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.beancount"
+        path.write_text("2020-01-01 open Assets:Cash USD\n")
+        paths.append(path)
+
+    LedgerService(paths[0]).load()
+    LedgerService(paths[1]).load()
+    LedgerService(paths[0]).load()  # now most recently used
+    LedgerService(paths[2]).load()
+    assert list(services._LEDGER_CACHE) == [str(paths[0].resolve()), str(paths[2].resolve())]
+
+
+def test_ledger_service_reuses_real_root_and_price_map(shared_beancount_file):
+    ledger = LedgerService(shared_beancount_file)
+    assert ledger.get_real_root() is ledger.get_real_root()
+    assert ledger.get_price_map() is ledger.get_price_map()
+    assert ledger.get_subtree_balances() is ledger.get_subtree_balances()
+
+
+def test_subtree_balances_match_compute_balance(tmp_path):
+    ledger_file = tmp_path / "main.beancount"
+    ledger_file.write_text(
+        "2020-01-01 open Assets:Bank:Checking\n"
+        "2020-01-01 open Assets:Bank:Savings\n"
+        "2020-01-01 open Assets:Cash\n"
+        "2020-01-01 open Equity:Opening\n"
+        '2023-01-01 * "Open"\n  Assets:Bank:Checking 10 USD\n  Assets:Bank:Savings 5 EUR\n'
+        "  Assets:Cash 2 USD\n  Equity:Opening -12 USD\n  Equity:Opening -5 EUR\n"
+    )
+    ledger = LedgerService(ledger_file)
+    balances = ledger.get_subtree_balances()
+
+    stack = [ledger.get_real_root()]
+    while stack:
+        node = stack.pop()
+        assert balances[node.account] == realization.compute_balance(node)
+        stack.extend(node.values())
+    assert balances["Assets:Bank"].get_currency_units("USD").number == Decimal("10")
+
+
+def test_services_share_injected_ledger_service(shared_beancount_file):
+    ledger = LedgerService(shared_beancount_file)
+    tx_service = TransactionService(shared_beancount_file, ledger_service=ledger)
+    account_service = AccountService(shared_beancount_file, ledger_service=ledger)
+    commodity_service = CommodityService(shared_beancount_file, ledger_service=ledger)
+
+    assert tx_service.validator.ledger is ledger
+    assert account_service.ledger_service is ledger
+    assert commodity_service.ledger_service is ledger
+
+
 def test_add_transaction(temp_beancount_file):
     service = TransactionService(temp_beancount_file)
 
-    tx = TransactionModel(
-        date=date(2023, 10, 1),
-        narration="Test Add",
-        postings=[
-            PostingModel(
-                account="Expenses:Food", units=AmountModel(number=Decimal("50.00"), currency="USD")
-            ),
-            PostingModel(
-                account="Assets:Cash", units=AmountModel(number=Decimal("-50.00"), currency="USD")
-            ),
-        ],
-    )
+    tx = _make_tx("Test Add", "50.00", date(2023, 10, 1))
 
     service.add_transaction(tx)
 
-    # Reload and verify
-    ledger = LedgerService(temp_beancount_file)
-    ledger.load()
+    # Reload the service's own ledger and verify
+    ledger = service.ledger_service
+    ledger.reload()
     # Find the new transaction
     found = False
     for e in ledger.entries:
@@ -48,13 +264,21 @@ def test_add_transaction(temp_beancount_file):
     assert found
 
 
+def test_format_transaction(shared_beancount_file):
+    service = TransactionService(shared_beancount_file)
+    tx = _make_tx("Draft Test", "5", date(2024, 1, 1), flag="!")
+    assert service.format_transaction(tx) == (
+        '2024-01-01 ! "Draft Test"\n  Expenses:Food   5 USD\n  Assets:Cash    -5 USD\n'
+    )
+
+
 def test_create_account(temp_beancount_file):
     service = AccountService(temp_beancount_file)
     model = AccountModel(name="Assets:NewBank", currencies=["USD"])
     service.create_account(model)
 
-    ledger = LedgerService(temp_beancount_file)
-    ledger.load()
+    ledger = service.ledger_service
+    ledger.reload()
     accounts = ledger.get_accounts()
     assert "Assets:NewBank" in accounts
 
@@ -63,8 +287,8 @@ def test_create_commodity(temp_beancount_file):
     service = CommodityService(temp_beancount_file)
     service.create_commodity("BTC", name="Bitcoin")
 
-    ledger = LedgerService(temp_beancount_file)
-    ledger.load()
+    ledger = service.ledger_service
+    ledger.reload()
     commodities = ledger.get_commodities()
     assert "BTC" in commodities
 
@@ -86,42 +310,38 @@ def test_add_transaction_directory_mode(tmp_path):
 
     service = TransactionService(ledger_file)
 
-    tx = TransactionModel(
-        date=date(2023, 11, 1),
-        narration="Dir Test",
-        postings=[
-            PostingModel(
-                account="Expenses:Food", units=AmountModel(number=Decimal("15.00"), currency="USD")
-            ),
-            PostingModel(
-                account="Assets:Cash", units=AmountModel(number=Decimal("-15.00"), currency="USD")
-            ),
-        ],
-    )
+    tx = _make_tx("Dir Test", "15.00")
 
     service.add_transaction(tx)
 
     # Verify a file was created in tx_dir
     files = list(tx_dir.glob("*.beancount"))
     assert len(files) == 1
+    assert files[0].name.endswith("_DirTest.beancount")
     content = files[0].read_text()
     assert "Dir Test" in content
 
 
+def test_add_transaction_inbox_file_appends(tmp_path):
+    ledger_file = tmp_path / "main.beancount"
+    ledger_file.write_text(
+        "2020-01-01 open Assets:Cash USD\n"
+        "2020-01-01 open Expenses:Food USD\n"
+        '2020-01-01 custom "cli-config" "new_transaction_file" "inbox/{year}.beancount"\n'
+    )
+    service = TransactionService(ledger_file)
+
+    for narration in ("First", "Second"):
+        service.add_transaction(_make_tx(narration, "1.00"))
+
+    content = (tmp_path / "inbox" / "2023.beancount").read_text()
+    assert content.startswith('2023-11-01 * "First"')
+    assert '\n\n2023-11-01 * "Second"' in content
+
+
 def test_report_balances(temp_beancount_file):
     service = TransactionService(temp_beancount_file)
-    tx = TransactionModel(
-        date=date(2023, 11, 1),
-        narration="Report Test",
-        postings=[
-            PostingModel(
-                account="Expenses:Food", units=AmountModel(number=Decimal("10.00"), currency="USD")
-            ),
-            PostingModel(
-                account="Assets:Cash", units=AmountModel(number=Decimal("-10.00"), currency="USD")
-            ),
-        ],
-    )
+    tx = _make_tx("Report Test", "10.00")
     service.add_transaction(tx)
 
     from beancount_cli.services import LedgerService, ReportService
@@ -174,3 +394,80 @@ def test_holdings_in_target_currency_equal_position_amount(tmp_path):
         )
     assert holdings["totals"]["EUR"]["market"] == expected
     assert holdings["totals"]["EUR"]["cost"] == expected
+
+
+def test_holdings_leaf_detection_with_sibling_prefixes(tmp_path):
+    ledger_file = tmp_path / "ledger.beancount"
+    ledger_file.write_text(
+        'option "operating_currency" "EUR"\n'
+        "2020-01-01 open Assets:Bank EUR\n"
+        "2020-01-01 open Assets:Bank-X EUR\n"
+        "2020-01-01 open Assets:Bank:Checking EUR\n"
+        '2022-01-01 * "Opening"\n'
+        "  Assets:Bank             1.00 EUR\n"
+        "  Assets:Bank-X           2.00 EUR\n"
+        "  Assets:Bank:Checking    3.00 EUR\n"
+        "  Equity:Opening         -6.00 EUR\n"
+    )
+    from beancount_cli.services import ReportService
+
+    holdings = ReportService(LedgerService(ledger_file)).get_holdings(target_currencies=["EUR"])
+    assert sorted(holdings["accounts"]) == ["Assets:Bank-X", "Assets:Bank:Checking"]
+
+
+def test_validate_many(shared_beancount_file):
+    from beancount_cli.services import ValidationService
+
+    def tx(account: str) -> TransactionModel:
+        units = AmountModel(number=Decimal("1.00"), currency="USD")
+        return TransactionModel(
+            date=date(2023, 1, 2),
+            narration="Batch",
+            postings=[PostingModel(account=account, units=units)],
+        )
+
+    validator = ValidationService(LedgerService(shared_beancount_file))
+    errors = validator.validate_many([tx("Assets:Cash"), tx("Assets:Missing")])
+    assert errors[0] == []
+    assert errors[1] == ["Account 'Assets:Missing' does not exist (no Open directive)."]
+
+
+def test_list_transactions_regex_filters(shared_beancount_file):
+    service = TransactionService(shared_beancount_file)
+
+    assert len(service.list_transactions(account_regex="^Income:")) == 1
+    assert service.list_transactions(account_regex="^Expenses:") == []
+    assert len(service.list_transactions(payee_regex="Employ")) == 1
+    assert service.list_transactions(payee_regex="^Nobody") == []
+    assert service.list_transactions(tag="missing") == []
+    assert len(service.list_transactions(account_regex="Cash", currency="USD")) == 1
+    assert service.list_transactions(account_regex="Cash", currency="EUR") == []
+    assert len(service.list_transactions(account_regex=re.compile(r"^income:", re.I))) == 1
+
+
+def test_list_transactions_tag_and_currency_indexes(tmp_path):
+    ledger_file = tmp_path / "main.beancount"
+    ledger_file.write_text(
+        "2020-01-01 open Assets:Cash\n"
+        "2020-01-01 open Expenses:Food\n"
+        '2023-01-01 * "A" #trip\n  Expenses:Food 5 EUR\n  Assets:Cash -5 EUR\n'
+        '2023-01-02 * "B" #trip\n  Expenses:Food 5 USD\n  Assets:Cash -5 USD\n'
+        '2023-01-03 * "C"\n  Expenses:Food 5 USD\n  Assets:Cash -5 USD\n'
+    )
+    service = TransactionService(ledger_file)
+
+    assert [tx.narration for tx in service.list_transactions(tag="trip")] == ["A", "B"]
+    assert [tx.narration for tx in service.list_transactions(currency="USD")] == ["B", "C"]
+    assert [tx.narration for tx in service.list_transactions(tag="trip", currency="USD")] == ["B"]
+    assert service.list_transactions(tag="trip", currency="GBP") == []
+
+
+def test_list_currency_postings(shared_beancount_file):
+    service = TransactionService(shared_beancount_file)
+    pairs = service.list_currency_postings("USD")
+    assert len(pairs) == 1
+    tx, postings = pairs[0]
+    assert tx.narration == "Salary"
+    assert {p.account for p in postings} == {"Income:Salary", "Assets:Cash"}
+
+    assert service.list_currency_postings("EUR") == []